@@ -3,10 +3,48 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-import sys
-import time
+import os
+import platform
+import subprocess
+from collections import Counter
+from typing import Dict, Tuple
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+from core.naming import style_slug
+
+JOBS_PER_PAGE = 50
+
+STATUS_EMOJI = {
+    'Queued': '⏳',
+    'Processing': '🔄',
+    'Completed': '✅',
+    'Failed': '❌',
+    'Cancelled': '🚫'
+}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _scan_outputs(output_dir: str, prefix: str, mtime_ns: int) -> Dict[str, int]:
+    """Map output filename -> size in bytes with a single directory scan.
+    
+    `mtime_ns` (the directory's) only keys the cache, so new outputs show up at once.
+    """
+    try:
+        with os.scandir(output_dir) as it:
+            return {e.name: e.stat().st_size for e in it
+                    if e.name.startswith(prefix) and e.name.endswith('.mp4')}
+    except OSError:
+        return {}
+
+
+def _open_folder(path: str):
+    """Open a folder in the platform file manager."""
+    system = platform.system()
+    if system == 'Windows':
+        os.startfile(path)
+    elif system == 'Darwin':
+        subprocess.Popen(['open', path])
+    else:
+        subprocess.Popen(['xdg-open', path])
 
 
 def show():
@@ -34,7 +72,143 @@ def show():
             st.caption("Monitor here")
         return
     
-    # Statistics
+    # Job controls
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🗑️ Clear Completed", use_container_width=True):
+            job_manager.clear_completed()
+            st.toast("Cleared completed jobs", icon="✅")
+            st.rerun()
+    with col2:
+        # The click itself reruns the script; no explicit st.rerun() needed
+        st.button("🔄 Refresh", use_container_width=True)
+    with col3:
+        auto_refresh = st.checkbox("Auto-refresh (5s)", value=False, key="batch_auto_refresh")
+    
+    # Pagination (stats still cover every job)
+    num_pages = max(1, -(-len(all_jobs) // JOBS_PER_PAGE))
+    page = 1
+    if num_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1,
+                               key="batch_page")
+    start = (page - 1) * JOBS_PER_PAGE
+    stop = start + JOBS_PER_PAGE
+    visible_jobs = all_jobs[start:stop]
+    
+    st.markdown("---")
+    
+    # Stats + table rerun on their own timer; the rest of the page stays mounted
+    run_every = "5s" if auto_refresh else None
+    st.fragment(_jobs_overview, run_every=run_every)(job_manager, start, stop)
+    
+    st.markdown("---")
+    
+    # Job details (expandable)
+    st.markdown("### 📝 Job Details")
+    
+    for job in visible_jobs:
+        status_emoji = STATUS_EMOJI.get(job.status, '❓')
+        
+        # Stateful expander: only the open job's details are built
+        expander = st.expander(f"{status_emoji} Job **{job.id}** - {job.status}",
+                               key=f"job_{job.id}", on_change="rerun")
+        if expander.open:
+            with expander:
+                _render_job_details(job_manager, job)
+
+
+def _render_job_details(job_manager, job):
+    """Render the body of a job's details expander."""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"**📁 Input:** `{Path(job.input_path).name}`")
+        st.markdown(f"**🎨 Styles:** {', '.join(job.styles)}")
+        st.markdown(f"**⚙️ Preset:** {job.preset}")
+        st.markdown(f"**🎚️ Intensity:** {job.effect_intensity}x")
+    
+    with col2:
+        st.markdown(f"**📊 Status:** {job.status}")
+        
+        if job.status == 'Processing':
+            # Live progress streams in through its own fragment
+            st.fragment(_job_progress, run_every="1s")(job_manager, job.id)
+        
+        elif job.status == 'Completed':
+            st.success("✅ Processing completed successfully!")
+            if job.completed_at:
+                st.caption(f"Completed: {job.completed_at}")
+            
+            # Output downloads (file is only read when the button is clicked)
+            input_stem = Path(job.input_path).stem
+            output_dir = Path(job.output_path)
+            try:
+                dir_mtime = os.stat(job.output_path).st_mtime_ns
+            except OSError:
+                dir_mtime = 0
+            existing = _scan_outputs(job.output_path, f"{input_stem}_", dir_mtime)
+            for style in job.styles:
+                slug = style_slug(style)
+                expected_name = f"{input_stem}_{slug}.mp4"
+                if expected_name in existing:
+                    expected_file = output_dir / expected_name
+                    size_mb = existing[expected_name] / (1024 * 1024)
+                    st.download_button(
+                        f"📥 {style} ({size_mb:.1f} MB)",
+                        data=expected_file.read_bytes,
+                        file_name=expected_file.name,
+                        mime="video/mp4",
+                        key=f"download_{job.id}_{slug}",
+                        use_container_width=True
+                    )
+        
+        elif job.status == 'Failed':
+            st.error(f"❌ Error: {job.error}")
+        
+        elif job.status == 'Queued':
+            st.info("⏳ Waiting in queue...")
+    
+    # Action buttons
+    st.markdown("---")
+    btn_col1, btn_col2, btn_col3 = st.columns(3)
+    
+    with btn_col1:
+        if job.status in ['Queued', 'Processing']:
+            if st.button(f"❌ Cancel", key=f"cancel_{job.id}", use_container_width=True):
+                job_manager.cancel_job(job.id)
+                st.toast(f"Job {job.id} cancelled", icon="✅")
+                st.rerun()
+    
+    with btn_col2:
+        if job.status == 'Completed':
+            if st.button(f"📁 Open Output", key=f"open_{job.id}", use_container_width=True):
+                try:
+                    _open_folder(job.output_path)
+                except Exception as e:
+                    st.error(f"❌ Could not open folder: {e}")
+    
+    with btn_col3:
+        if job.status in ['Completed', 'Failed', 'Cancelled']:
+            if st.button(f"🗑️ Remove", key=f"remove_{job.id}", use_container_width=True):
+                del job_manager.jobs[job.id]
+                st.toast(f"Job {job.id} removed", icon="✅")
+                st.rerun()
+
+
+def _jobs_overview(job_manager, start: int, stop: int):
+    """Render job statistics and the jobs table page (runs as a fragment)."""
+    all_jobs = job_manager.get_all_jobs()
+    
+    # Reuse last tick's stats/table when no job has changed since
+    state_hash = hash((start, stop) + tuple((j.id, j.status, round(j.progress, 1), round(j.fps, 1))
+                                            for j in all_jobs))
+    cached = st.session_state.get('_jobs_overview_cache')
+    if cached is not None and cached[0] == state_hash:
+        _, counts, df = cached
+    else:
+        counts, df = _build_overview(all_jobs, all_jobs[start:stop])
+        st.session_state._jobs_overview_cache = (state_hash, counts, df)
+    
     stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
     
     with stats_col1:
@@ -42,141 +216,68 @@ def show():
         st.metric("📊 Total Jobs", total)
     
     with stats_col2:
-        processing = len([j for j in all_jobs if j.status == 'Processing'])
+        processing = counts['Processing']
         st.metric("🔄 Processing", processing)
     
     with stats_col3:
-        completed = len([j for j in all_jobs if j.status == 'Completed'])
+        completed = counts['Completed']
         st.metric("✅ Completed", completed)
     
     with stats_col4:
-        failed = len([j for j in all_jobs if j.status in ['Failed', 'Cancelled']])
+        failed = counts['Failed'] + counts['Cancelled']
         st.metric("❌ Failed", failed)
     
     st.markdown("---")
     
-    # Job controls
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        if st.button("🗑️ Clear Completed", use_container_width=True):
-            job_manager.clear_completed()
-            st.success("✅ Cleared completed jobs")
-            time.sleep(0.5)
-            st.rerun()
-    with col2:
-        if st.button("🔄 Refresh", use_container_width=True):
-            st.rerun()
-    with col3:
-        auto_refresh = st.checkbox("Auto-refresh (5s)", value=False)
-    
-    st.markdown("---")
-    
     # Display jobs table
     st.markdown("### 📋 Active Jobs")
     
-    # Create DataFrame
-    job_data = []
-    for job in all_jobs:
-        job_data.append({
-            'ID': job.id,
-            'Input': Path(job.input_path).name if job.input_path else 'N/A',
-            'Styles': ', '.join(job.styles[:2]) + ('...' if len(job.styles) > 2 else ''),
-            'Status': job.status,
-            'Progress': f"{job.progress:.1f}%",
-            'FPS': f"{job.fps:.1f}" if job.fps > 0 else '-'
-        })
-    
-    df = pd.DataFrame(job_data)
-    
     # Display with styling
     st.dataframe(
         df,
         use_container_width=True,
         hide_index=True
     )
+
+
+def _build_overview(all_jobs, page_jobs) -> Tuple[Counter, pd.DataFrame]:
+    """Compute status counts over all jobs and the table for one page."""
+    # Statistics (single pass over all jobs)
+    counts = Counter(j.status for j in all_jobs)
     
-    st.markdown("---")
+    # Create DataFrame (column-wise)
+    df = pd.DataFrame({
+        'ID': [j.id for j in page_jobs],
+        'Input': [Path(j.input_path).name if j.input_path else 'N/A' for j in page_jobs],
+        'Styles': [', '.join(j.styles[:2]) + ('...' if len(j.styles) > 2 else '') for j in page_jobs],
+        'Status': [j.status for j in page_jobs],
+        'Progress': [f"{j.progress:.1f}%" for j in page_jobs],
+        'FPS': [f"{j.fps:.1f}" if j.fps > 0 else '-' for j in page_jobs]
+    })
     
-    # Job details (expandable)
-    st.markdown("### 📝 Job Details")
+    return counts, df
+
+
+def _job_progress(job_manager, job_id: str):
+    """Render live progress for a processing job (runs as a fragment)."""
+    job = job_manager.get_job(job_id)
+    if job is None or job.status != 'Processing':
+        # Job finished or was removed - refresh the whole page once
+        st.rerun()
     
-    for job in all_jobs:
-        # Status emoji
-        status_emoji = {
-            'Queued': '⏳',
-            'Processing': '🔄',
-            'Completed': '✅',
-            'Failed': '❌',
-            'Cancelled': '🚫'
-        }.get(job.status, '❓')
-        
-        with st.expander(f"{status_emoji} Job **{job.id}** - {job.status}"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"**📁 Input:** `{Path(job.input_path).name}`")
-                st.markdown(f"**🎨 Styles:** {', '.join(job.styles)}")
-                st.markdown(f"**⚙️ Preset:** {job.preset}")
-                st.markdown(f"**🎚️ Intensity:** {job.effect_intensity}x")
-            
-            with col2:
-                st.markdown(f"**📊 Status:** {job.status}")
-                
-                if job.status == 'Processing':
-                    # Show progress
-                    st.progress(job.progress / 100.0, text=f"{job.progress:.1f}% complete")
-                    
-                    # Show stats
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.metric("FPS", f"{job.fps:.1f}")
-                    with col_b:
-                        if job.eta_seconds > 0:
-                            eta_min = int(job.eta_seconds / 60)
-                            eta_sec = int(job.eta_seconds % 60)
-                            st.metric("ETA", f"{eta_min}m {eta_sec}s")
-                        else:
-                            st.metric("ETA", "Calculating...")
-                    
-                    st.caption(f"Frame {job.current_frame} / {job.total_frames}")
-                
-                elif job.status == 'Completed':
-                    st.success("✅ Processing completed successfully!")
-                    if job.completed_at:
-                        st.caption(f"Completed: {job.completed_at}")
-                
-                elif job.status == 'Failed':
-                    st.error(f"❌ Error: {job.error}")
-                
-                elif job.status == 'Queued':
-                    st.info("⏳ Waiting in queue...")
-            
-            # Action buttons
-            st.markdown("---")
-            btn_col1, btn_col2, btn_col3 = st.columns(3)
-            
-            with btn_col1:
-                if job.status in ['Queued', 'Processing']:
-                    if st.button(f"❌ Cancel", key=f"cancel_{job.id}", use_container_width=True):
-                        job_manager.cancel_job(job.id)
-                        st.success(f"✅ Job {job.id} cancelled")
-                        time.sleep(0.5)
-                        st.rerun()
-            
-            with btn_col2:
-                if job.status == 'Completed':
-                    st.button(f"📁 Open Output", key=f"open_{job.id}", use_container_width=True,
-                             disabled=True, help="Feature coming soon")
-            
-            with btn_col3:
-                if job.status in ['Completed', 'Failed', 'Cancelled']:
-                    if st.button(f"🗑️ Remove", key=f"remove_{job.id}", use_container_width=True):
-                        del job_manager.jobs[job.id]
-                        st.success(f"✅ Job {job.id} removed")
-                        time.sleep(0.5)
-                        st.rerun()
-    
-    # Auto-refresh
-    if auto_refresh:
-        time.sleep(5)
-        st.rerun()
\ No newline at end of file
+    # Show progress
+    st.progress(job.progress / 100.0, text=f"{job.progress:.1f}% complete")
+    
+    # Show stats
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("FPS", f"{job.fps:.1f}")
+    with col_b:
+        if job.eta_seconds > 0:
+            eta_min = int(job.eta_seconds / 60)
+            eta_sec = int(job.eta_seconds % 60)
+            st.metric("ETA", f"{eta_min}m {eta_sec}s")
+        else:
+            st.metric("ETA", "Calculating...")
+    
+    st.caption(f"Frame {job.current_frame} / {job.total_frames}")
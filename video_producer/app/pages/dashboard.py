@@ -2,23 +2,65 @@
 
 import streamlit as st
 from pathlib import Path
+import bisect
+import hashlib
 import sys
 import tempfile
 import os
+import shutil
+import time
+from typing import Dict, Optional
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+_ROOT = str(Path(__file__).resolve().parents[2])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from core.presets import PresetManager
 from core.hardware import HardwareManager
 
+STYLE_NAMES = ('Pencil Sketch', 'Cartoon', 'Comic/Halftone', 'Cinematic', 'Fast Neural Style')
+
+# Slider moves in 0.1 steps: < 0.7 Subtle, 0.7-1.3 Normal, >= 1.4 Strong
+INTENSITY_LABELS = ('Subtle', 'Normal', 'Strong')
+INTENSITY_THRESHOLDS = (0.7, 1.4)
+
+UPLOAD_DIR = Path(tempfile.gettempdir()) / "video_producer_uploads"
+UPLOAD_DIR.mkdir(exist_ok=True)
+
+
+@st.cache_resource
+def _preset_mgr() -> PresetManager:
+    """PresetManager shared across reruns."""
+    return PresetManager()
+
+
+@st.cache_resource
+def _hw_mgr() -> HardwareManager:
+    """HardwareManager shared across reruns (NVML is probed once)."""
+    return HardwareManager()
+
+
+def _poll_gpu(hw_mgr: HardwareManager, interval: float = 2.0) -> Dict:
+    """Sample GPU memory/temperature at most once per `interval` seconds."""
+    now = time.monotonic()
+    sample = st.session_state.get('_gpu_sample')
+    if sample is None or now - sample['t'] >= interval:
+        sample = {
+            't': now,
+            'mem': hw_mgr.get_gpu_memory_usage(),
+            'temp': hw_mgr.get_gpu_temperature()
+        }
+        st.session_state['_gpu_sample'] = sample
+    return sample
+
 
 def show():
     st.markdown("<h1 class='main-header'>Dashboard</h1>", unsafe_allow_html=True)
     st.markdown("Process videos with artistic styles powered by intelligent pattern learning")
     
-    # Initialize managers
-    preset_mgr = PresetManager()
-    hw_mgr = HardwareManager()
+    # Shared managers
+    preset_mgr = _preset_mgr()
+    hw_mgr = _hw_mgr()
     job_manager = st.session_state.job_manager
     
     # Two columns: Input | Preview
@@ -27,48 +69,7 @@ def show():
     with col1:
         st.markdown("### 📁 Input Configuration")
         
-        # File upload options
-        input_method = st.radio(
-            "Input Method",
-            ["📁 File Browser (Upload)", "📝 Enter Path", "🗂️ Folder Path"],
-            horizontal=True
-        )
-        
-        input_path = None
-        
-        if input_method == "📁 File Browser (Upload)":
-            uploaded_file = st.file_uploader(
-                "Choose a video file",
-                type=['mp4', 'avi', 'mov', 'mkv', 'webm'],
-                help="Upload a video file from your computer"
-            )
-            
-            if uploaded_file:
-                # Save uploaded file to temporary location
-                temp_dir = Path(tempfile.gettempdir()) / "video_producer_uploads"
-                temp_dir.mkdir(exist_ok=True)
-                
-                temp_path = temp_dir / uploaded_file.name
-                with open(temp_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                input_path = str(temp_path)
-                st.success(f"✅ Uploaded: {uploaded_file.name}")
-                st.info(f"📍 Location: {input_path}")
-        
-        elif input_method == "📝 Enter Path":
-            input_path = st.text_input(
-                "Video Path",
-                placeholder="/path/to/video.mp4 or C:\\Videos\\video.mp4",
-                help="Enter the full path to your video file"
-            )
-        
-        else:  # Folder Path
-            input_path = st.text_input(
-                "Folder Path",
-                placeholder="/path/to/videos/ or C:\\Videos\\",
-                help="Enter path to folder containing multiple videos"
-            )
+        input_path = _render_input()
         
         st.markdown("---")
         
@@ -86,15 +87,8 @@ def show():
             style_cinematic = st.checkbox('🎬 Cinematic', value=False)
             style_neural = st.checkbox('🧠 Neural Style', value=False)
         
-        styles = {
-            'Pencil Sketch': style_pencil,
-            'Cartoon': style_cartoon,
-            'Comic/Halftone': style_comic,
-            'Cinematic': style_cinematic,
-            'Fast Neural Style': style_neural
-        }
-        
-        selected_styles = [k for k, v in styles.items() if v]
+        style_flags = (style_pencil, style_cartoon, style_comic, style_cinematic, style_neural)
+        selected_styles = [name for name, flag in zip(STYLE_NAMES, style_flags) if flag]
         
         st.markdown("---")
         
@@ -109,7 +103,7 @@ def show():
             help="1.0 = Normal, < 1.0 = Subtle, > 1.0 = Strong"
         )
         
-        intensity_label = "Subtle" if effect_intensity < 0.7 else "Normal" if effect_intensity <= 1.3 else "Strong"
+        intensity_label = INTENSITY_LABELS[bisect.bisect_right(INTENSITY_THRESHOLDS, round(effect_intensity, 1))]
         st.caption(f"Current intensity: **{intensity_label}** ({effect_intensity}x)")
         
         st.markdown("---")
@@ -171,22 +165,9 @@ def show():
             for style in selected_styles:
                 st.markdown(f"- **{style}** (Intensity: {effect_intensity}x)")
         
-        # Hardware info
-        st.markdown("### 💻 Hardware Status")
-        
-        if hw_mgr.gpu_available:
-            st.markdown(f"**GPU:** {hw_mgr.gpu_info.get('name', 'Unknown')}")
-            
-            mem_info = hw_mgr.get_gpu_memory_usage()
-            if mem_info:
-                st.progress(mem_info['utilization'] / 100.0, text=f"VRAM: {mem_info['utilization']:.1f}%")
-            
-            temp = hw_mgr.get_gpu_temperature()
-            if temp:
-                temp_color = "🟢" if temp < 70 else "🟡" if temp < 80 else "🔴"
-                st.metric("GPU Temperature", f"{temp}°C", delta=f"{temp_color}")
-        else:
-            st.info("ℹ️ Running on CPU (GPU not detected)")
+        # Hardware info refreshes on its own timer, independent of the form
+        hw_refresh = 2.0 if hw_mgr.gpu_available else None
+        st.fragment(_render_hw_status, run_every=hw_refresh)(hw_mgr)
         
         # Preset info
         st.markdown("### ⚙️ Preset Details")
@@ -211,9 +192,49 @@ def show():
         elif not Path(input_path).exists():
             st.error(f"❌ File not found: {input_path}")
         else:
-            with st.spinner("🔄 Generating preview (processing first 5 seconds)..."):
-                st.info("⏳ Preview functionality coming soon...")
-                st.success("✅ Quick preview feature will be available in next update")
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            
+            try:
+                with st.spinner("🔄 Generating preview (processing first 5 seconds)..."):
+                    # Heavy processing imports are only paid when a preview is requested
+                    from core.video_processor import VideoProcessor
+                    
+                    processor = VideoProcessor(
+                        input_path=input_path,
+                        output_dir=output_dir,
+                        styles=selected_styles,
+                        preset=preset_name,
+                        effect_intensity=effect_intensity
+                    )
+                    result = processor.preview(seconds=5)
+                
+                if result['success']:
+                    st.success(f"✅ Preview ready: {result['style']} "
+                               f"({result['processing_time']:.1f}s)")
+                    st.video(result['output_path'])
+                    
+                    # Extrapolate from the fields preview() actually returns
+                    duration = result['duration'] or result['preview_seconds']
+                    est_seconds = (result['processing_time'] * (duration / result['preview_seconds'])
+                                   * len(selected_styles))
+                    st.caption(f"Estimated full processing time: ~{est_seconds / 60:.1f} min "
+                               f"for {len(selected_styles)} style(s)")
+                    
+                    # Read lazily on click; "ignore" keeps the preview on screen
+                    preview_file = Path(result['output_path'])
+                    st.download_button(
+                        "📥 Download Preview",
+                        data=preview_file.read_bytes,
+                        file_name=preview_file.name,
+                        mime="video/mp4",
+                        on_click="ignore"
+                    )
+                else:
+                    st.error(f"❌ Preview failed: {result['error']}")
+                
+            except Exception as e:
+                st.error(f"❌ Failed to generate preview: {str(e)}")
+                st.exception(e)
     
     if process_btn:
         if not input_path:
@@ -255,4 +276,90 @@ def show():
                 
             except Exception as e:
                 st.error(f"❌ Failed to add job: {str(e)}")
-                st.exception(e)
\ No newline at end of file
+                st.exception(e)
+
+
+def _upload_digest(uploaded_file) -> str:
+    """Hash of the full upload (already in memory, so one pass and no disk reads)."""
+    with uploaded_file.getbuffer() as buf:
+        return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+
+def _save_upload(uploaded_file) -> str:
+    """Persist an upload once; identical content is never rewritten."""
+    saved = st.session_state.setdefault('_saved_uploads', {})
+    path = saved.get(uploaded_file.file_id)
+    if path is None:
+        # Content-addressed directory keeps the original filename for output naming
+        digest = _upload_digest(uploaded_file)
+        temp_path = UPLOAD_DIR / digest / uploaded_file.name
+        if not temp_path.exists():
+            temp_path.parent.mkdir(exist_ok=True)
+            # Write-then-rename so a partial file never looks like a saved upload
+            tmp_path = temp_path.with_name(temp_path.name + '.part')
+            uploaded_file.seek(0)
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(uploaded_file, f, length=4 * 1024 * 1024)
+            os.replace(tmp_path, temp_path)
+        path = saved[uploaded_file.file_id] = str(temp_path)
+    return path
+
+
+def _render_input() -> Optional[str]:
+    """Render the input method selector and return the chosen path."""
+    # File upload options
+    input_method = st.radio(
+        "Input Method",
+        ["📁 File Browser (Upload)", "📝 Enter Path", "🗂️ Folder Path"],
+        horizontal=True
+    )
+    
+    input_path = None
+    
+    if input_method == "📁 File Browser (Upload)":
+        uploaded_file = st.file_uploader(
+            "Choose a video file",
+            type=['mp4', 'avi', 'mov', 'mkv', 'webm'],
+            help="Upload a video file from your computer"
+        )
+        
+        if uploaded_file:
+            # Save uploaded file to temporary location
+            input_path = _save_upload(uploaded_file)
+            st.success(f"✅ Uploaded: {uploaded_file.name}")
+            st.info(f"📍 Location: {input_path}")
+    
+    elif input_method == "📝 Enter Path":
+        input_path = st.text_input(
+            "Video Path",
+            placeholder="/path/to/video.mp4 or C:\\Videos\\video.mp4",
+            help="Enter the full path to your video file"
+        )
+    
+    else:  # Folder Path
+        input_path = st.text_input(
+            "Folder Path",
+            placeholder="/path/to/videos/ or C:\\Videos\\",
+            help="Enter path to folder containing multiple videos"
+        )
+    
+    return input_path
+
+
+def _render_hw_status(hw_mgr: HardwareManager):
+    """Render the GPU status panel (runs as a fragment)."""
+    st.markdown("### 💻 Hardware Status")
+    
+    if hw_mgr.gpu_available:
+        st.markdown(f"**GPU:** {hw_mgr.gpu_info.get('name', 'Unknown')}")
+        
+        sample = _poll_gpu(hw_mgr)
+        mem_info, temp = sample['mem'], sample['temp']
+        if mem_info:
+            st.progress(mem_info['utilization'] / 100.0, text=f"VRAM: {mem_info['utilization']:.1f}%")
+        
+        if temp:
+            temp_color = "🟢" if temp < 70 else "🟡" if temp < 80 else "🔴"
+            st.metric("GPU Temperature", f"{temp}°C", delta=f"{temp_color}")
+    else:
+        st.info("ℹ️ Running on CPU (GPU not detected)")
@@ -2,6 +2,8 @@
 
 import streamlit as st
 from pathlib import Path
+from typing import Dict
+import os
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -9,17 +11,46 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from core.hardware import HardwareManager
 from core.presets import PresetManager
 
+# How long a GPU telemetry snapshot is reused across reruns
+GPU_POLL_INTERVAL_SECONDS = float(os.environ.get('GPU_POLL_INTERVAL_SECONDS', '2.0'))
+
+
+@st.cache_resource
+def _hw_mgr() -> HardwareManager:
+    """HardwareManager shared across reruns (NVML is probed once)."""
+    return HardwareManager()
+
+
+@st.cache_resource
+def _preset_mgr() -> PresetManager:
+    """PresetManager shared across reruns."""
+    return PresetManager()
+
+
+@st.cache_data(ttl=GPU_POLL_INTERVAL_SECONDS, show_spinner=False)
+def _hw_snapshot() -> Dict:
+    """Hardware snapshot reused until the poll interval elapses."""
+    return _hw_mgr().snapshot()
+
 
 def show():
     st.markdown("<h1 class='main-header'>Settings & Hardware</h1>", unsafe_allow_html=True)
     st.markdown("Configure hardware and application settings")
     
-    # Initialize managers
-    hw_mgr = HardwareManager()
-    preset_mgr = PresetManager()
+    # Shared managers
+    hw_mgr = _hw_mgr()
+    preset_mgr = _preset_mgr()
     
     # Hardware tab
-    st.markdown("### Hardware Information")
+    hdr_col, refresh_col = st.columns([4, 1])
+    with hdr_col:
+        st.markdown("### Hardware Information")
+    with refresh_col:
+        if st.button("🔄 Refresh", key="hw_refresh", use_container_width=True):
+            _hw_snapshot.clear()
+    
+    # One pass over all hardware info/telemetry (TTL-cached between widget reruns)
+    snap = _hw_snapshot()
     
     col1, col2 = st.columns(2)
     
@@ -28,12 +59,12 @@ def show():
         
         if hw_mgr.gpu_available:
             st.success("✅ GPU Detected")
-            st.markdown(f"**Name:** {hw_mgr.gpu_info.get('name', 'Unknown')}")
-            st.markdown(f"**Driver:** {hw_mgr.gpu_info.get('driver_version', 'Unknown')}")
-            st.markdown(f"**CUDA:** {hw_mgr.gpu_info.get('cuda_version', 'Unknown')}")
+            st.markdown(f"**Name:** {snap['name']}")
+            st.markdown(f"**Driver:** {snap['driver_version']}")
+            st.markdown(f"**CUDA:** {snap['cuda_version']}")
             
             # Memory info
-            mem_info = hw_mgr.get_gpu_memory_usage()
+            mem_info = snap['memory']
             if mem_info:
                 total_gb = mem_info['total'] / (1024**3)
                 used_gb = mem_info['used'] / (1024**3)
@@ -41,14 +72,14 @@ def show():
                 st.progress(mem_info['utilization'] / 100.0)
             
             # Temperature
-            temp = hw_mgr.get_gpu_temperature()
+            temp = snap['temperature']
             if temp:
                 st.markdown(f"**Temperature:** {temp}°C")
                 if temp > 80:
                     st.warning("⚠️ GPU temperature is high")
             
             # Utilization
-            util = hw_mgr.get_gpu_utilization()
+            util = snap['utilization']
             if util:
                 st.markdown(f"**Utilization:** {util:.1f}%")
         else:
@@ -58,7 +89,7 @@ def show():
     with col2:
         st.markdown("#### NVENC Status")
         
-        nvenc_available = hw_mgr.check_nvenc()
+        nvenc_available = snap['nvenc']
         if nvenc_available:
             st.success("✅ NVENC Available")
             st.markdown("Hardware-accelerated encoding enabled")
@@ -69,7 +100,7 @@ def show():
             st.info("Update NVIDIA drivers to enable NVENC")
         
         st.markdown("#### Codec Selection")
-        recommended = hw_mgr.get_recommended_codec()
+        recommended = snap['codec']
         st.markdown(f"**Recommended:** {recommended}")
     
     st.markdown("---")
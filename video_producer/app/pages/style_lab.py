@@ -2,15 +2,152 @@
 
 import streamlit as st
 from pathlib import Path
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import atexit
+import base64
+import json
+import os
 import sys
+import tempfile
+import threading
+import time
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+STYLE_NAMES = ('Pencil Sketch', 'Cartoon', 'Comic/Halftone', 'Cinematic', 'Fast Neural Style')
+
+# Parameter-tuning widgets per style: (widget, label, positional args)
+TUNING_PARAMS = {
+    'Pencil': [
+        (st.slider, "Blur Sigma", (5.0, 50.0, 21.0)),
+        (st.checkbox, "Use Paper Texture", ()),
+    ],
+    'Cartoon': [
+        (st.slider, "Number of Colors", (4, 16, 8)),
+        (st.slider, "Edge Strength", (50, 200, 100)),
+    ],
+    'Comic': [
+        (st.slider, "Halftone Dot Size", (2, 8, 3)),
+        (st.slider, "Edge Thickness", (1, 5, 2)),
+    ],
+    'Cinematic': [
+        (st.slider, "Bloom Strength", (0.0, 1.0, 0.3)),
+        (st.slider, "Grain Strength", (0.0, 0.1, 0.02)),
+        (st.slider, "Vignette Strength", (0.0, 1.0, 0.4)),
+    ],
+}
+
+# 4x3 light-gray PNG shown until a comparison exists (no network fetch)
+PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAQAAAADCAIAAAA7ljmRAAAAGklEQVQIHTXBIQEAAAACIP1/jFkmocgVuSI3qTUHDLjpptoAAAAASUVORK5CYII="
+)
+
+COMPARISON_DIR = Path(tempfile.gettempdir()) / "video_producer_style_lab"
+
+FEEDBACK_FILE = Path("logs/feedback.json")
+FEEDBACK_FLUSH_SECONDS = 5.0
+
+# New feedback entries (from every session) not yet written to FEEDBACK_FILE
+_pending_feedback: List[Dict] = []
+_pending_since: Optional[float] = None
+_feedback_lock = threading.Lock()
+
+
+def _load_feedback() -> List[Dict]:
+    """Load previously saved feedback entries."""
+    try:
+        with open(FEEDBACK_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _write_feedback(entries: List[Dict]):
+    """Write the full feedback list in a single dump (write-then-rename)."""
+    FEEDBACK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = FEEDBACK_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(entries, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, FEEDBACK_FILE)
+
+
+def _queue_feedback(entry: Dict):
+    """Buffer one feedback entry for the next flush."""
+    global _pending_since
+    with _feedback_lock:
+        _pending_feedback.append(entry)
+        if _pending_since is None:
+            _pending_since = time.time()
+
+
+def _flush_feedback(force: bool = False):
+    """Append buffered feedback to the file once it has been pending long enough."""
+    global _pending_since
+    with _feedback_lock:
+        if not _pending_feedback:
+            return
+        if not force and time.time() - _pending_since <= FEEDBACK_FLUSH_SECONDS:
+            return
+        # Re-read so entries saved by other writers since our last flush are kept
+        _write_feedback(_load_feedback() + _pending_feedback)
+        _pending_feedback.clear()
+        _pending_since = None
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _get_processor(video_path: str, mtime: float, styles: tuple):
+    """VideoProcessor (probe, analysis and stylizers) reused across clicks for the same sample."""
+    from core.video_processor import VideoProcessor
+    
+    return VideoProcessor(
+        input_path=video_path,
+        output_dir=str(COMPARISON_DIR),
+        styles=list(styles)
+    )
+
+
+def _sample_mtime(video_path: str) -> Optional[float]:
+    """Modification time of the sample, or None if it is missing (one stat call)."""
+    if not video_path:
+        return None
+    try:
+        return os.stat(video_path).st_mtime
+    except OSError:
+        return None
+
+
+def _generate_comparison(video_path: str, mtime: float, styles: List[str],
+                         seconds: float) -> List[Dict]:
+    """Render a preview per style in parallel; results keep the order of `styles`."""
+    processor = _get_processor(video_path, mtime, tuple(styles))
+    
+    # Each style writes its own preview file, so the renders don't contend
+    results = [None] * len(styles)
+    with ThreadPoolExecutor(max_workers=min(len(styles), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(processor.preview, seconds=seconds, style=style): idx
+                   for idx, style in enumerate(styles)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    return results
+
+
+@atexit.register
+def _flush_pending_feedback():
+    """Final flush on shutdown."""
+    _flush_feedback(force=True)
+
 
 def show():
     st.markdown("<h1 class='main-header'>Style Lab</h1>", unsafe_allow_html=True)
     st.markdown("Compare styles and provide feedback for ML learning")
     
+    # Feedback is buffered in memory and flushed to disk in batches
+    _flush_feedback()
+    
     # Sample selection
     st.markdown("### Select Sample")
     
@@ -22,8 +159,54 @@ def show():
     with col2:
         duration = st.slider("Duration (s)", 5, 30, 10)
     
+    compare_styles = st.multiselect("Styles to Compare", STYLE_NAMES, default=list(STYLE_NAMES[:2]))
+    
     if st.button("🎬 Generate Comparison", type="primary"):
-        st.info("Processing sample with all styles...")
+        # The path is only stat'ed on click, and once: existence and cache key together
+        sample_mtime = _sample_mtime(sample_video)
+        if sample_mtime is None:
+            st.error("❌ Please enter a valid video path")
+        elif not compare_styles:
+            st.error("❌ Please select at least one style")
+        else:
+            # Same sample (path + mtime), styles and duration: the previews on disk are still valid
+            comparison_key = (sample_video, sample_mtime, tuple(compare_styles), duration)
+            previous = st.session_state.get('comparison_results')
+            if (st.session_state.get('_comparison_key') == comparison_key and previous
+                    and all(Path(r['output_path']).exists() for r in previous if r['success'])):
+                st.toast("Sample unchanged - showing previous comparison", icon="♻️")
+            else:
+                with st.spinner(f"Processing sample with {len(compare_styles)} styles..."):
+                    try:
+                        st.session_state.comparison_results = _generate_comparison(
+                            sample_video, sample_mtime, compare_styles, duration)
+                        st.session_state._comparison_key = comparison_key
+                    except Exception as e:
+                        st.error(f"❌ Comparison failed: {str(e)}")
+    
+    # Comparison results
+    results = st.session_state.get('comparison_results')
+    if results:
+        result_cols = st.columns(len(results))
+        for col, result in zip(result_cols, results):
+            with col:
+                if result['success']:
+                    st.markdown(f"**{result['style']}**")
+                    st.video(result['output_path'])
+                    st.caption(f"⏱️ {result['processing_time']:.1f}s")
+                    # File is only read when the button is clicked
+                    output_file = Path(result['output_path'])
+                    st.download_button(
+                        "📥 Download",
+                        data=output_file.read_bytes,
+                        file_name=output_file.name,
+                        mime="video/mp4",
+                        key=f"compare_download_{output_file.stem}",
+                        on_click="ignore",
+                        use_container_width=True
+                    )
+                else:
+                    st.error(f"❌ {result['error']}")
     
     st.markdown("---")
     
@@ -34,12 +217,12 @@ def show():
     
     with col_a:
         st.markdown("#### Style A: Pencil Sketch")
-        st.image("https://via.placeholder.com/400x300.png?text=Style+A", use_container_width=True)
+        st.image(PLACEHOLDER_PNG, caption="Style A", use_container_width=True)
         rating_a = st.slider("Rate Style A", 1, 5, 3, key="rating_a")
     
     with col_b:
         st.markdown("#### Style B: Cartoon")
-        st.image("https://via.placeholder.com/400x300.png?text=Style+B", use_container_width=True)
+        st.image(PLACEHOLDER_PNG, caption="Style B", use_container_width=True)
         rating_b = st.slider("Rate Style B", 1, 5, 4, key="rating_b")
     
     # Comparison notes
@@ -50,11 +233,8 @@ def show():
     if st.button("💾 Save Feedback", type="primary"):
         st.success("✅ Feedback saved! This will help improve ML models.")
         
-        # Store feedback
-        if 'feedback' not in st.session_state:
-            st.session_state.feedback = []
-        
-        st.session_state.feedback.append({
+        # Store feedback (appended to disk by the next flush)
+        _queue_feedback({
             'style_a': 'Pencil',
             'style_b': 'Cartoon',
             'rating_a': rating_a,
@@ -69,19 +249,8 @@ def show():
     
     style_select = st.selectbox("Select Style", ['Pencil', 'Cartoon', 'Comic', 'Cinematic', 'Neural Style'])
     
-    if style_select == 'Pencil':
-        blur_sigma = st.slider("Blur Sigma", 5.0, 50.0, 21.0)
-        use_texture = st.checkbox("Use Paper Texture")
-    elif style_select == 'Cartoon':
-        num_colors = st.slider("Number of Colors", 4, 16, 8)
-        edge_strength = st.slider("Edge Strength", 50, 200, 100)
-    elif style_select == 'Comic':
-        dot_size = st.slider("Halftone Dot Size", 2, 8, 3)
-        edge_thickness = st.slider("Edge Thickness", 1, 5, 2)
-    elif style_select == 'Cinematic':
-        bloom_strength = st.slider("Bloom Strength", 0.0, 1.0, 0.3)
-        grain_strength = st.slider("Grain Strength", 0.0, 0.1, 0.02)
-        vignette_strength = st.slider("Vignette Strength", 0.0, 1.0, 0.4)
+    for widget, label, args in TUNING_PARAMS.get(style_select, ()):
+        widget(label, *args)
     
     if st.button("🔄 Auto-Tune Parameters"):
         with st.spinner("Searching optimal parameters..."):
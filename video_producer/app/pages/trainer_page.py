@@ -3,11 +3,22 @@
 import streamlit as st
 from pathlib import Path
 import sys
-import pandas as pd
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 
+@st.cache_resource
+def _load_checkpoints_df():
+    """Checkpoint table built once; treat the returned frame as read-only."""
+    import pandas as pd
+    
+    checkpoints = [
+        {'version': 'v1.0', 'date': '2025-01-15', 'metrics': 'SSIM: 0.85', 'status': 'Active'},
+        {'version': 'v0.9', 'date': '2025-01-10', 'metrics': 'SSIM: 0.82', 'status': 'Archived'},
+    ]
+    return pd.DataFrame(checkpoints)
+
+
 def show():
     st.markdown("<h1 class='main-header'>Trainer</h1>", unsafe_allow_html=True)
     st.markdown("Fine-tune ML models with user feedback")
@@ -57,7 +68,8 @@ def show():
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i in range(1, 101):
+        # 10% steps: one frontend update per step instead of per percent
+        for i in range(10, 101, 10):
             progress_bar.progress(i / 100)
             status_text.text(f"Epoch 1/1 - {i}% complete")
         
@@ -71,12 +83,7 @@ def show():
     # Show available checkpoints
     st.markdown("#### Available Checkpoints")
     
-    checkpoints = [
-        {'version': 'v1.0', 'date': '2025-01-15', 'metrics': 'SSIM: 0.85', 'status': 'Active'},
-        {'version': 'v0.9', 'date': '2025-01-10', 'metrics': 'SSIM: 0.82', 'status': 'Archived'},
-    ]
-    
-    df = pd.DataFrame(checkpoints)
+    df = _load_checkpoints_df()
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Checkpoint actions
@@ -84,10 +91,12 @@ def show():
     
     with col1:
         if st.button("💾 Export Current Model"):
+            _load_checkpoints_df.clear()
             st.success("✅ Model exported to assets/models/")
     
     with col2:
         if st.button("⏮️ Rollback to Previous"):
+            _load_checkpoints_df.clear()
             st.info("Rolled back to v0.9")
     
     st.markdown("---")
@@ -2,10 +2,21 @@
 
 import streamlit as st
 from pathlib import Path
+import importlib
 import sys
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Add parent directory to path (the script re-executes on every rerun)
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+PAGES = {
+    "Dashboard": "pages.dashboard",
+    "Batch Queue": "pages.batch_queue",
+    "Style Lab": "pages.style_lab",
+    "Trainer": "pages.trainer_page",
+    "Settings": "pages.settings_page",
+}
 
 # Configure page
 st.set_page_config(
@@ -15,12 +26,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def _job_manager():
+    """JobManager shared by every session (jobs and worker live server-side)."""
+    from core.job_manager import JobManager
+    return JobManager()
+
+
+@st.cache_resource
+def _prewarm_nvenc_probe():
+    """Run the one-time FFmpeg encoder probe in the background at server start."""
+    import threading
+    from core.hardware import nvenc_encoders
+    threading.Thread(target=nvenc_encoders, daemon=True).start()
+
+
+@st.cache_data(ttl=1.0, show_spinner=False)
+def _job_stats(_job_manager) -> tuple:
+    """(total, completed, active) job counts; one pass over the jobs, reused for a second."""
+    all_jobs = _job_manager.get_all_jobs()
+    completed = sum(j.status == 'Completed' for j in all_jobs)
+    active = sum(j.status == 'Processing' for j in all_jobs)
+    return len(all_jobs), completed, active
+
+
+def _quick_stats(job_manager):
+    """Render sidebar job stats (runs as a fragment)."""
+    total, completed, active = _job_stats(job_manager)
+    
+    st.metric("Total Jobs", total)
+    st.metric("Completed", completed)
+    st.metric("Active", active)
+
+
+_prewarm_nvenc_probe()
+
 # Initialize session state FIRST
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 'Dashboard'
 if 'job_manager' not in st.session_state:
-    from core.job_manager import JobManager
-    st.session_state.job_manager = JobManager()
+    st.session_state.job_manager = _job_manager()
 if 'total_jobs' not in st.session_state:
     st.session_state.total_jobs = 0
 if 'completed_jobs' not in st.session_state:
@@ -69,9 +114,9 @@ with st.sidebar:
     # Page selection
     page = st.radio(
         "Select Page",
-        ["Dashboard", "Batch Queue", "Style Lab", "Trainer", "Settings"],
+        list(PAGES),
         key="page_selector",
-        index=["Dashboard", "Batch Queue", "Style Lab", "Trainer", "Settings"].index(st.session_state.current_page)
+        index=list(PAGES).index(st.session_state.current_page)
     )
     
     # Update current page
@@ -80,14 +125,10 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### Quick Stats")
     
-    # Get real stats from job manager
+    # Get real stats from job manager; poll on a timer only while jobs are running
     job_manager = st.session_state.job_manager
-    all_jobs = job_manager.get_all_jobs()
-    completed = len([j for j in all_jobs if j.status == 'Completed'])
-    
-    st.metric("Total Jobs", len(all_jobs))
-    st.metric("Completed", completed)
-    st.metric("Active", len([j for j in all_jobs if j.status == 'Processing']))
+    stats_refresh = 2 if _job_stats(job_manager)[2] else None
+    st.fragment(_quick_stats, run_every=stats_refresh)(job_manager)
     
     st.markdown("---")
     st.markdown("""
@@ -100,25 +141,9 @@ with st.sidebar:
     ✅ Pattern Learning
     """)
 
-# Dynamic import based on current page
-import importlib
-
+# Dynamic import based on current page (only the selected page is ever imported)
 try:
-    if page == "Dashboard":
-        from pages import dashboard
-        dashboard.show()
-    elif page == "Batch Queue":
-        from pages import batch_queue
-        batch_queue.show()
-    elif page == "Style Lab":
-        from pages import style_lab
-        style_lab.show()
-    elif page == "Trainer":
-        from pages import trainer_page
-        trainer_page.show()
-    elif page == "Settings":
-        from pages import settings_page
-        settings_page.show()
+    importlib.import_module(PAGES[page]).show()
 except Exception as e:
     st.error(f"Error loading page: {e}")
     st.exception(e)
\ No newline at end of file
@@ -1,34 +1,43 @@
-"""Core video processing modules."""
-
-from .io import VideoReader, VideoWriter
-from .pipeline import Pipeline
-from .temporal import TemporalStabilizer
-from .color import ColorSpaceManager
-from .metrics import MetricsCollector
-from .ml_session import MLSession
-from .autotune import AutoTuner
-from .checkpoint import CheckpointManager
-from .logging_config import setup_logging, get_logger
-from .presets import PresetManager
-from .job_manager import JobManager, Job
-from .video_processor import VideoProcessor
-from .pattern_learner import PatternLearner
-
-__all__ = [
-    'VideoReader',
-    'VideoWriter',
-    'Pipeline',
-    'TemporalStabilizer',
-    'ColorSpaceManager',
-    'MetricsCollector',
-    'MLSession',
-    'AutoTuner',
-    'CheckpointManager',
-    'setup_logging',
-    'get_logger',
-    'PresetManager',
-    'JobManager',
-    'Job',
-    'VideoProcessor',
-    'PatternLearner'
-]
\ No newline at end of file
+"""Core video processing modules.
+
+Exports are imported on first access (PEP 562), so importing one
+submodule (e.g. `core.presets`) doesn't pull in the heavy ones.
+"""
+
+import importlib
+
+# Exported name -> defining submodule
+_EXPORTS = {
+    'VideoReader': 'io',
+    'VideoWriter': 'io',
+    'Pipeline': 'pipeline',
+    'run_stream': 'pipeline_stream',
+    'TemporalStabilizer': 'temporal',
+    'ColorSpaceManager': 'color',
+    'MetricsCollector': 'metrics',
+    'MLSession': 'ml_session',
+    'AutoTuner': 'autotune',
+    'CheckpointManager': 'checkpoint',
+    'setup_logging': 'logging_config',
+    'get_logger': 'logging_config',
+    'PresetManager': 'presets',
+    'JobManager': 'job_manager',
+    'Job': 'job_manager',
+    'VideoProcessor': 'video_processor',
+    'PatternLearner': 'pattern_learner',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,65 +2,132 @@
 
 import numpy as np
 from typing import Dict, Callable, List, Tuple
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Longer side of the frame used for tuning evaluations
+MAX_TUNE_SIDE = 512
+
+# Metric scores remembered per (image digest, metric)
+METRIC_CACHE_SIZE = 256
+
 
 class AutoTuner:
     """Auto-tune style parameters."""
     
     def __init__(self):
         self.best_params = {}
+        self._metric_cache: Dict[Tuple[bytes, str], float] = {}
+        self._gray_buf = None
     
     def tune_parameters(self,
                        sample_frame: np.ndarray,
                        stylizer: Callable,
                        param_ranges: Dict[str, List],
-                       metric: str = 'edge_coherence') -> Dict:
-        """Search parameter space for best results."""
+                       metric: str = 'edge_coherence',
+                       max_rounds: int = 2) -> Dict:
+        """Search parameter space for best results (coordinate descent)."""
         
         logger.info(f"Tuning parameters for {len(param_ranges)} params")
         
-        best_score = -np.inf
-        best_params = {}
+        # Metrics are roughly scale-invariant; tune on a small copy
+        frame = self._downsample(sample_frame)
+        scores: Dict[Tuple, float] = {}
         
-        # Grid search (simplified for MVP)
-        for param_name, param_values in param_ranges.items():
-            for value in param_values:
-                # Create param dict
-                test_params = {param_name: value}
-                
-                # Apply stylizer
+        def evaluate(params: Dict) -> float:
+            key = tuple(sorted(params.items()))
+            if key not in scores:
                 try:
-                    result = stylizer(sample_frame, test_params)
-                    score = self._evaluate_result(result, metric)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_params[param_name] = value
-                        
+                    result = stylizer(frame, dict(params))
+                    scores[key] = self._evaluate_result(result, metric)
                 except Exception as e:
-                    logger.warning(f"Failed to test {param_name}={value}: {e}")
+                    logger.warning(f"Failed to test {params}: {e}")
+                    scores[key] = -np.inf
+            return scores[key]
+        
+        # Start from the middle of each range, then improve one param at a time
+        best_params = {name: values[len(values) // 2]
+                       for name, values in param_ranges.items() if values}
+        best_score = evaluate(best_params)
+        
+        for _ in range(max_rounds):
+            improved = False
+            for param_name, param_values in param_ranges.items():
+                if not param_values:
+                    continue
+                value, score = self._search_param(
+                    param_values, lambda v: evaluate({**best_params, param_name: v}))
+                if score > best_score:
+                    best_score = score
+                    best_params[param_name] = value
+                    improved = True
+            if not improved:
+                break
         
-        logger.info(f"Best params: {best_params} (score: {best_score:.4f})")
+        logger.info(f"Best params: {best_params} (score: {best_score:.4f}, "
+                    f"{len(scores)} evaluations)")
         self.best_params = best_params
         
         return best_params
     
+    @staticmethod
+    def _search_param(values: List, score_fn: Callable) -> Tuple:
+        """Ternary search over an ordered candidate list (assumes a single peak)."""
+        lo, hi = 0, len(values) - 1
+        while hi - lo > 2:
+            m1 = lo + (hi - lo) // 3
+            m2 = hi - (hi - lo) // 3
+            if score_fn(values[m1]) < score_fn(values[m2]):
+                lo = m1 + 1
+            else:
+                hi = m2 - 1
+        
+        best = max(range(lo, hi + 1), key=lambda i: score_fn(values[i]))
+        return values[best], score_fn(values[best])
+    
+    @staticmethod
+    def _downsample(frame: np.ndarray) -> np.ndarray:
+        """Shrink frame so its longer side is at most MAX_TUNE_SIDE."""
+        import cv2
+        
+        h, w = frame.shape[:2]
+        scale = MAX_TUNE_SIDE / max(h, w)
+        if scale >= 1:
+            return frame
+        return cv2.resize(frame, (round(w * scale), round(h * scale)),
+                          interpolation=cv2.INTER_AREA)
+    
     def _evaluate_result(self, img: np.ndarray, metric: str) -> float:
-        """Evaluate stylized result."""
+        """Evaluate stylized result (memoized on image content)."""
+        # Nearby params often produce identical output; skip re-scoring it
+        img = np.ascontiguousarray(img)
+        key = (hashlib.blake2b(img.data, digest_size=16).digest(), metric)
+        score = self._metric_cache.get(key)
+        if score is None:
+            score = self._compute_metric(img, metric)
+            if len(self._metric_cache) >= METRIC_CACHE_SIZE:
+                self._metric_cache.pop(next(iter(self._metric_cache)))
+            self._metric_cache[key] = score
+        return score
+    
+    def _compute_metric(self, img: np.ndarray, metric: str) -> float:
+        """Score one image."""
         import cv2
         
+        if metric not in ('edge_coherence', 'sharpness'):
+            return 0.0
+        
+        # Reuse one grayscale buffer across evaluations of same-sized frames
+        if self._gray_buf is None or self._gray_buf.shape != img.shape[:2]:
+            self._gray_buf = np.empty(img.shape[:2], dtype=np.uint8)
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY, dst=self._gray_buf)
+        
         if metric == 'edge_coherence':
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
             edges = cv2.Canny(gray, 50, 150)
-            return np.sum(edges > 0) / edges.size
+            return np.count_nonzero(edges) / edges.size
         
-        elif metric == 'sharpness':
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        else:  # sharpness
             laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-            return laplacian.var()
-        
-        else:
-            return 0.0
\ No newline at end of file
+            return laplacian.var()
\ No newline at end of file
@@ -1,10 +1,17 @@
 """Checkpoint management for resume capability."""
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, Optional
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,10 +25,20 @@ class CheckpointManager:
     def save(self, job_id: str, state: Dict):
         """Save checkpoint state."""
         checkpoint_file = self.checkpoint_dir / f"{job_id}.json"
+        tmp_file = checkpoint_file.with_suffix('.json.tmp')
         
         try:
-            with open(checkpoint_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                data = json.dumps(state, indent=2).encode('utf-8')
+            
+            # Write-then-rename so a crash never leaves a truncated checkpoint
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, checkpoint_file)
             logger.info(f"Checkpoint saved: {job_id}")
         except Exception as e:
             logger.error(f"Failed to save checkpoint: {e}")
@@ -34,8 +51,8 @@ class CheckpointManager:
             return None
         
         try:
-            with open(checkpoint_file, 'r') as f:
-                state = json.load(f)
+            data = checkpoint_file.read_bytes()
+            state = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
             logger.info(f"Checkpoint loaded: {job_id}")
             return state
         except Exception as e:
@@ -2,7 +2,104 @@
 
 import numpy as np
 import cv2
-from typing import Dict, Optional
+import importlib.util
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# numba is imported (and kernels compiled) on first use; importing it costs
+# more than the rest of `core` put together
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+
+@lru_cache(maxsize=1)
+def _lut3d_kernel():
+    """Numba LUT kernel (imports numba on first call)."""
+    from numba import njit, prange
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_lut3d_numba(img, lut, out):
+        """Fused gather + trilinear lerp, one pass over the pixels."""
+        h, w = img.shape[0], img.shape[1]
+        top = lut.shape[0] - 1
+        scale = top / 255.0
+        
+        for y in prange(h):
+            for x in range(w):
+                r = img[y, x, 0] * scale
+                g = img[y, x, 1] * scale
+                b = img[y, x, 2] * scale
+                
+                r0 = int(r)
+                g0 = int(g)
+                b0 = int(b)
+                r1 = min(r0 + 1, top)
+                g1 = min(g0 + 1, top)
+                b1 = min(b0 + 1, top)
+                rf = r - r0
+                gf = g - g0
+                bf = b - b0
+                
+                for c in range(3):
+                    c00 = lut[r0, g0, b0, c] * (1 - rf) + lut[r1, g0, b0, c] * rf
+                    c01 = lut[r0, g0, b1, c] * (1 - rf) + lut[r1, g0, b1, c] * rf
+                    c10 = lut[r0, g1, b0, c] * (1 - rf) + lut[r1, g1, b0, c] * rf
+                    c11 = lut[r0, g1, b1, c] * (1 - rf) + lut[r1, g1, b1, c] * rf
+                    
+                    c0 = c00 * (1 - gf) + c10 * gf
+                    c1 = c01 * (1 - gf) + c11 * gf
+                    
+                    v = (c0 * (1 - bf) + c1 * bf) * 255
+                    out[y, x, c] = np.uint8(min(max(v, 0.0), 255.0))
+    
+    return _apply_lut3d_numba
+
+
+# Side of the square tiles the NumPy LUT path works on
+LUT_TILE_SIZE = 256
+
+
+@lru_cache(maxsize=1)
+def _cuda_torch():
+    """torch module if a CUDA device is usable, else None (imported on first use)."""
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch if torch.cuda.is_available() else None
+
+
+# Device LUT volumes kept by apply_lut_3d_gpu: id(lut) -> (lut, volume)
+GPU_LUT_CACHE_SIZE = 4
+_gpu_luts: "OrderedDict[int, Tuple[np.ndarray, object]]" = OrderedDict()
+
+
+def _gpu_lut_volume(torch, lut: np.ndarray):
+    """fp16 (1, C, R, G, B) CUDA volume for `lut`, uploaded once per LUT array.
+    
+    LUTs are treated as immutable (load_cube_lut's are read-only). The cache
+    holds a reference to each array so its id can't be reused while cached.
+    """
+    key = id(lut)
+    entry = _gpu_luts.get(key)
+    if entry is not None and entry[0] is lut:
+        _gpu_luts.move_to_end(key)
+        return entry[1]
+    
+    # LUT [r, g, b, c] -> volume (1, C, D=r, H=g, W=b)
+    volume = torch.from_numpy(np.ascontiguousarray(lut, dtype=np.float16)).cuda()
+    volume = volume.permute(3, 0, 1, 2).unsqueeze(0).contiguous()
+    _gpu_luts[key] = (lut, volume)
+    if len(_gpu_luts) > GPU_LUT_CACHE_SIZE:
+        _gpu_luts.popitem(last=False)
+    return volume
+
+
+@lru_cache(maxsize=8)
+def _gamma_lut(gamma: float) -> np.ndarray:
+    """uint8 code value -> linear float32 for one gamma (256 entries)."""
+    return np.power(np.arange(256, dtype=np.float32) / 255.0, gamma)
 
 
 class ColorSpaceManager:
@@ -15,104 +112,157 @@ class ColorSpaceManager:
     }
     
     @staticmethod
-    def rgb_to_linear(img: np.ndarray, gamma: float = 2.2) -> np.ndarray:
-        """Convert sRGB to linear RGB."""
-        img_float = img.astype(np.float32) / 255.0
-        linear = np.power(img_float, gamma)
+    def rgb_to_linear(img: np.ndarray, gamma: float = 2.2,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert sRGB to linear RGB (into `out`, a float32 array of img's shape, if given)."""
+        if img.dtype == np.uint8:
+            # Only 256 possible inputs: a table lookup instead of a per-pixel pow
+            return cv2.LUT(img, _gamma_lut(gamma), dst=out)
+        
+        linear = np.multiply(img, np.float32(1 / 255.0), out=out, dtype=np.float32)
+        np.power(linear, gamma, out=linear)
         return linear
     
     @staticmethod
-    def linear_to_rgb(img: np.ndarray, gamma: float = 2.2) -> np.ndarray:
-        """Convert linear RGB to sRGB."""
-        srgb = np.power(np.clip(img, 0, 1), 1.0 / gamma)
-        return (srgb * 255).astype(np.uint8)
+    def linear_to_rgb(img: np.ndarray, gamma: float = 2.2,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert linear RGB to sRGB (into `out`, a uint8 array of img's shape, if given)."""
+        # clip() returns a fresh array, so the rest can run in place
+        srgb = np.clip(img, 0, 1).astype(np.result_type(img.dtype, np.float32), copy=False)
+        np.power(srgb, 1.0 / gamma, out=srgb)
+        srgb *= 255
+        if out is None:
+            return srgb.astype(np.uint8)
+        np.copyto(out, srgb, casting='unsafe')
+        return out
     
     @staticmethod
     def apply_lut_3d(img: np.ndarray, lut: np.ndarray) -> np.ndarray:
         """Apply 3D LUT to image."""
-        # Normalize to LUT space
-        img_norm = img.astype(np.float32) / 255.0
-        lut_size = lut.shape[0]
-        
-        # Scale to LUT indices
-        coords = img_norm * (lut_size - 1)
-        
-        # Trilinear interpolation
-        r_idx = np.clip(coords[:, :, 0], 0, lut_size - 1)
-        g_idx = np.clip(coords[:, :, 1], 0, lut_size - 1)
-        b_idx = np.clip(coords[:, :, 2], 0, lut_size - 1)
-        
-        # Floor and ceiling indices
-        r0 = np.floor(r_idx).astype(np.int32)
-        g0 = np.floor(g_idx).astype(np.int32)
-        b0 = np.floor(b_idx).astype(np.int32)
-        
-        r1 = np.minimum(r0 + 1, lut_size - 1)
-        g1 = np.minimum(g0 + 1, lut_size - 1)
-        b1 = np.minimum(b0 + 1, lut_size - 1)
-        
-        # Fractional parts
-        r_frac = r_idx - r0
-        g_frac = g_idx - g0
-        b_frac = b_idx - b0
-        
-        # 8 corner lookups
-        c000 = lut[r0, g0, b0]
-        c001 = lut[r0, g0, b1]
-        c010 = lut[r0, g1, b0]
-        c011 = lut[r0, g1, b1]
-        c100 = lut[r1, g0, b0]
-        c101 = lut[r1, g0, b1]
-        c110 = lut[r1, g1, b0]
-        c111 = lut[r1, g1, b1]
-        
-        # Interpolate
-        r_frac = r_frac[:, :, np.newaxis]
-        g_frac = g_frac[:, :, np.newaxis]
-        b_frac = b_frac[:, :, np.newaxis]
+        if NUMBA_AVAILABLE:
+            out = np.empty(img.shape, dtype=np.uint8)
+            _lut3d_kernel()(np.ascontiguousarray(img, dtype=np.uint8),
+                            np.ascontiguousarray(lut, dtype=np.float32), out)
+            return out
         
-        c00 = c000 * (1 - r_frac) + c100 * r_frac
-        c01 = c001 * (1 - r_frac) + c101 * r_frac
-        c10 = c010 * (1 - r_frac) + c110 * r_frac
-        c11 = c011 * (1 - r_frac) + c111 * r_frac
-        
-        c0 = c00 * (1 - g_frac) + c10 * g_frac
-        c1 = c01 * (1 - g_frac) + c11 * g_frac
+        # NumPy fallback, one cache-sized tile at a time so the
+        # per-pixel intermediates stay small
+        h, w = img.shape[:2]
+        out = np.empty(img.shape, dtype=np.uint8)
+        for y0 in range(0, h, LUT_TILE_SIZE):
+            for x0 in range(0, w, LUT_TILE_SIZE):
+                tile = img[y0:y0 + LUT_TILE_SIZE, x0:x0 + LUT_TILE_SIZE]
+                out[y0:y0 + LUT_TILE_SIZE, x0:x0 + LUT_TILE_SIZE] = _lut_tile(tile, lut)
+        return out
+    
+    @staticmethod
+    def apply_lut_3d_gpu(img: np.ndarray, lut: np.ndarray) -> np.ndarray:
+        """Apply 3D LUT on the GPU with trilinear grid_sample (falls back to CPU)."""
+        torch = _cuda_torch()
+        if torch is None:
+            return ColorSpaceManager.apply_lut_3d(img, lut)
         
-        result = c0 * (1 - b_frac) + c1 * b_frac
+        import torch.nn.functional as F
         
-        return (result * 255).astype(np.uint8)
+        h, w = img.shape[:2]
+        with torch.no_grad():
+            # Half precision halves the memory traffic; the result is
+            # quantized to uint8 anyway. The volume is uploaded once per LUT.
+            lut_t = _gpu_lut_volume(torch, lut)
+            
+            # Pixel RGB -> normalized (x=b, y=g, z=r) sample coords in [-1, 1]
+            img_t = torch.from_numpy(np.ascontiguousarray(img, dtype=np.uint8)).cuda()
+            grid = img_t.half().mul_(2.0 / 255.0).sub_(1.0).flip(-1).view(1, 1, h, w, 3)
+            
+            # 5-D 'bilinear' is trilinear interpolation
+            out = F.grid_sample(lut_t, grid, mode='bilinear', align_corners=True)
+            out = out[0, :, 0].permute(1, 2, 0).mul_(255).clamp_(0, 255)
+            
+            return out.to(torch.uint8).cpu().numpy()
     
     @staticmethod
     def load_cube_lut(lut_path: str) -> np.ndarray:
-        """Load .cube LUT file."""
-        import re
-        
-        with open(lut_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Parse LUT size
-        lut_size = 32  # default
-        for line in lines:
-            if line.startswith('LUT_3D_SIZE'):
-                lut_size = int(line.split()[1])
-                break
-        
-        # Parse LUT data
-        lut_data = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('LUT'):
-                parts = line.split()
-                if len(parts) == 3:
-                    try:
-                        r, g, b = map(float, parts)
-                        lut_data.append([r, g, b])
-                    except ValueError:
-                        continue
-        
-        # Reshape to 3D LUT
-        lut_array = np.array(lut_data, dtype=np.float32)
-        lut_3d = lut_array.reshape(lut_size, lut_size, lut_size, 3)
-        
-        return lut_3d
\ No newline at end of file
+        """Load .cube LUT file (parsed once per file version; the result is read-only)."""
+        return _parse_cube_lut(str(lut_path), os.stat(lut_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _parse_cube_lut(lut_path: str, mtime_ns: int) -> np.ndarray:
+    """Parse a .cube file; `mtime_ns` only keys the cache."""
+    with open(lut_path, 'r') as f:
+        lines = f.read().splitlines()
+    
+    # Header: keywords (TITLE, LUT_3D_SIZE, DOMAIN_*) and comments until the first number
+    lut_size = 32  # default
+    data_start = len(lines)
+    for i, line in enumerate(lines):
+        line = line.lstrip()
+        if line.startswith('LUT_3D_SIZE'):
+            lut_size = int(line.split()[1])
+        elif line and (line[0].isdigit() or line[0] in '-+.'):
+            data_start = i
+            break
+    
+    # Parse the numeric block in C
+    lut_array = np.loadtxt(lines[data_start:], comments='#', dtype=np.float32, ndmin=2)
+    lut_3d = lut_array.reshape(lut_size, lut_size, lut_size, 3)
+    # Shared by every caller through the cache
+    lut_3d.flags.writeable = False
+    
+    return lut_3d
+
+
+def _lut_tile(img: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """Trilinear 3D LUT lookup for one image tile (NumPy)."""
+    # Normalize to LUT space
+    img_norm = img.astype(np.float32) / 255.0
+    lut_size = lut.shape[0]
+    
+    # Scale to LUT indices
+    coords = img_norm * (lut_size - 1)
+    
+    # Trilinear interpolation
+    r_idx = np.clip(coords[:, :, 0], 0, lut_size - 1)
+    g_idx = np.clip(coords[:, :, 1], 0, lut_size - 1)
+    b_idx = np.clip(coords[:, :, 2], 0, lut_size - 1)
+    
+    # Floor and ceiling indices
+    r0 = np.floor(r_idx).astype(np.int32)
+    g0 = np.floor(g_idx).astype(np.int32)
+    b0 = np.floor(b_idx).astype(np.int32)
+    
+    r1 = np.minimum(r0 + 1, lut_size - 1)
+    g1 = np.minimum(g0 + 1, lut_size - 1)
+    b1 = np.minimum(b0 + 1, lut_size - 1)
+    
+    # Fractional parts
+    r_frac = r_idx - r0
+    g_frac = g_idx - g0
+    b_frac = b_idx - b0
+    
+    # 8 corner lookups
+    c000 = lut[r0, g0, b0]
+    c001 = lut[r0, g0, b1]
+    c010 = lut[r0, g1, b0]
+    c011 = lut[r0, g1, b1]
+    c100 = lut[r1, g0, b0]
+    c101 = lut[r1, g0, b1]
+    c110 = lut[r1, g1, b0]
+    c111 = lut[r1, g1, b1]
+    
+    # Interpolate
+    r_frac = r_frac[:, :, np.newaxis]
+    g_frac = g_frac[:, :, np.newaxis]
+    b_frac = b_frac[:, :, np.newaxis]
+    
+    c00 = c000 * (1 - r_frac) + c100 * r_frac
+    c01 = c001 * (1 - r_frac) + c101 * r_frac
+    c10 = c010 * (1 - r_frac) + c110 * r_frac
+    c11 = c011 * (1 - r_frac) + c111 * r_frac
+    
+    c0 = c00 * (1 - g_frac) + c10 * g_frac
+    c1 = c01 * (1 - g_frac) + c11 * g_frac
+    
+    result = c0 * (1 - b_frac) + c1 * b_frac
+    
+    return (result * 255).astype(np.uint8)
@@ -2,7 +2,9 @@
 
 import subprocess
 import logging
-from typing import Dict, Optional
+import atexit
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
 
 try:
     import pynvml
@@ -13,14 +15,33 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+NVENC_ENCODERS = ('h264_nvenc', 'hevc_nvenc', 'av1_nvenc')
+
+
+@lru_cache(maxsize=1)
+def nvenc_encoders() -> FrozenSet[str]:
+    """NVENC encoders this FFmpeg build offers (probed once per process)."""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    return frozenset(e for e in NVENC_ENCODERS if e in result.stdout)
+
 
 class HardwareManager:
     """Detect and manage hardware resources."""
     
     def __init__(self):
         self.gpu_available = False
-        self.nvenc_available = False
+        self.nvenc_available: Optional[bool] = None  # set by check_nvenc()
         self.gpu_info = {}
+        self._handle = None
+        self._nvml_initialized = False
         
         if NVML_AVAILABLE:
             self._init_nvml()
@@ -29,18 +50,22 @@ class HardwareManager:
         """Initialize NVIDIA Management Library."""
         try:
             pynvml.nvmlInit()
+            self._nvml_initialized = True
+            # Keep the NVML session open for the process lifetime
+            atexit.register(self.cleanup)
             device_count = pynvml.nvmlDeviceGetCount()
             
             if device_count > 0:
                 self.gpu_available = True
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                # Cached device handle reused by every telemetry query
+                self._handle = pynvml.nvmlDeviceGetHandleByIndex(0)
                 
                 self.gpu_info = {
-                    'name': pynvml.nvmlDeviceGetName(handle).decode('utf-8'),
+                    'name': pynvml.nvmlDeviceGetName(self._handle).decode('utf-8'),
                     'driver_version': pynvml.nvmlSystemGetDriverVersion().decode('utf-8'),
                     'cuda_version': pynvml.nvmlSystemGetCudaDriverVersion(),
-                    'memory_total': pynvml.nvmlDeviceGetMemoryInfo(handle).total,
-                    'compute_capability': pynvml.nvmlDeviceGetCudaComputeCapability(handle)
+                    'memory_total': pynvml.nvmlDeviceGetMemoryInfo(self._handle).total,
+                    'compute_capability': pynvml.nvmlDeviceGetCudaComputeCapability(self._handle)
                 }
                 
                 logger.info(f"GPU detected: {self.gpu_info['name']}")
@@ -48,19 +73,12 @@ class HardwareManager:
         except Exception as e:
             logger.warning(f"NVML initialization failed: {e}")
     
-    def check_nvenc(self) -> bool:
-        """Check if NVENC is available."""
-        try:
-            result = subprocess.run(
-                ['ffmpeg', '-hide_banner', '-encoders'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            self.nvenc_available = 'h264_nvenc' in result.stdout
-            return self.nvenc_available
-        except:
-            return False
+    def check_nvenc(self, refresh: bool = False) -> bool:
+        """Check if NVENC is available (ffmpeg is probed once per process)."""
+        if refresh:
+            nvenc_encoders.cache_clear()
+        self.nvenc_available = 'h264_nvenc' in nvenc_encoders()
+        return self.nvenc_available
     
     def get_gpu_memory_usage(self) -> Optional[Dict]:
         """Get GPU memory usage."""
@@ -68,8 +86,7 @@ class HardwareManager:
             return None
         
         try:
-            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            mem_info = pynvml.nvmlDeviceGetMemoryInfo(self._handle)
             
             return {
                 'total': mem_info.total,
@@ -87,8 +104,7 @@ class HardwareManager:
             return None
         
         try:
-            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+            temp = pynvml.nvmlDeviceGetTemperature(self._handle, pynvml.NVML_TEMPERATURE_GPU)
             return float(temp)
         except Exception as e:
             logger.error(f"Failed to get GPU temperature: {e}")
@@ -100,13 +116,46 @@ class HardwareManager:
             return None
         
         try:
-            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            util = pynvml.nvmlDeviceGetUtilizationRates(self._handle)
             return float(util.gpu)
         except Exception as e:
             logger.error(f"Failed to get GPU utilization: {e}")
             return None
     
+    def snapshot(self) -> Dict:
+        """Collect GPU info, telemetry and codec support in one pass."""
+        nvenc = self.check_nvenc()
+        snap = {
+            'name': self.gpu_info.get('name', 'Unknown'),
+            'driver_version': self.gpu_info.get('driver_version', 'Unknown'),
+            'cuda_version': self.gpu_info.get('cuda_version', 'Unknown'),
+            'memory': None,
+            'temperature': None,
+            'utilization': None,
+            'nvenc': nvenc,
+            'codec': 'h264_nvenc' if nvenc else 'libx264'
+        }
+        
+        if not NVML_AVAILABLE or not self.gpu_available:
+            return snap
+        
+        try:
+            handle = self._handle
+            mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            snap['memory'] = {
+                'total': mem_info.total,
+                'used': mem_info.used,
+                'free': mem_info.free,
+                'utilization': (mem_info.used / mem_info.total) * 100
+            }
+            snap['temperature'] = float(
+                pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+            snap['utilization'] = float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu)
+        except Exception as e:
+            logger.error(f"Failed to read GPU telemetry: {e}")
+        
+        return snap
+    
     def get_recommended_codec(self) -> str:
         """Get recommended codec based on hardware."""
         if self.check_nvenc():
@@ -117,7 +166,11 @@ class HardwareManager:
     
     def cleanup(self):
         """Cleanup NVML."""
-        if NVML_AVAILABLE:
+        if NVML_AVAILABLE and self._nvml_initialized:
+            atexit.unregister(self.cleanup)
+            self._nvml_initialized = False
+            self._handle = None
+            self.gpu_available = False
             try:
                 pynvml.nvmlShutdown()
             except:
@@ -2,11 +2,18 @@
 
 import subprocess
 import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 import numpy as np
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Iterator
+from typing import Dict, Iterable, List, Optional, Tuple, Iterator
 import logging
 
+from .hardware import nvenc_encoders
+
 # PyAV is optional - fallback to FFmpeg if not available
 try:
     import av
@@ -15,8 +22,47 @@ except ImportError:
     PYAV_AVAILABLE = False
     av = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Linux pipes default to 64 KB while one 1080p RGB frame is ~6 MB
+PIPE_BUFFER_SIZE = 1 << 20
+
+# Encoder log lines kept for error reporting
+STDERR_TAIL_LINES = 50
+
+# NVENC codecs already reported as unavailable (warn once, not per writer)
+_warned_codecs = set()
+
+
+def _grow_pipe(pipe) -> None:
+    """Enlarge an OS pipe buffer (Linux only) so frames move in fewer blocking writes."""
+    if pipe is None or fcntl is None or not hasattr(fcntl, 'F_SETPIPE_SZ'):
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except OSError:
+        # Above /proc/sys/fs/pipe-max-size for this user - keep the default
+        pass
+
+
+def _parse_frame_rate(rate: str, default: float = 30.0) -> float:
+    """Parse an FFprobe rate such as '30000/1001' ('0/0' means unknown)."""
+    try:
+        return float(Fraction(rate))
+    except (ValueError, ZeroDivisionError):
+        return default
+
 
 class VideoProbe:
     """Probe video metadata with FFprobe."""
@@ -34,8 +80,8 @@ class VideoProbe:
         ]
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            data = orjson.loads(result.stdout) if ORJSON_AVAILABLE else json.loads(result.stdout)
             
             # Find video and audio streams
             video_stream = next((s for s in data['streams'] if s['codec_type'] == 'video'), None)
@@ -48,7 +94,7 @@ class VideoProbe:
             metadata = {
                 'width': int(video_stream['width']),
                 'height': int(video_stream['height']),
-                'fps': eval(video_stream.get('r_frame_rate', '30/1')),
+                'fps': _parse_frame_rate(video_stream.get('r_frame_rate', '30/1')),
                 'duration': float(data['format'].get('duration', 0)),
                 'codec': video_stream['codec_name'],
                 'pix_fmt': video_stream.get('pix_fmt', 'yuv420p'),
@@ -73,8 +119,26 @@ class VideoProbe:
             logger.error(f"FFprobe failed: {e}")
             raise
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses this too
             logger.error(f"Failed to parse FFprobe output: {e}")
             raise
+    
+    @staticmethod
+    def probe_many(video_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """Probe several files concurrently (each FFprobe runs as its own process).
+        
+        Files that fail to probe are left out of the result.
+        """
+        video_paths = list(video_paths)
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            futures = {path: pool.submit(VideoProbe.probe, path) for path in video_paths}
+            for path, future in futures.items():
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    logger.warning(f"Skipping {path}: {e}")
+        return results
 
 
 class VideoReader:
@@ -93,6 +157,9 @@ class VideoReader:
         if self.use_pyav and av:
             self.container = av.open(self.video_path)
             self.stream = self.container.streams.video[0]
+            # Let FFmpeg decode with frame + slice threads; decode, not the
+            # RGB conversion, dominates read time
+            self.stream.thread_type = 'AUTO'
             
             # Seek to start frame if needed
             if self.start_frame > 0:
@@ -121,8 +188,9 @@ class VideoReader:
         self.process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.DEVNULL
         )
+        _grow_pipe(self.process.stdout)
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.container:
@@ -162,6 +230,23 @@ class VideoReader:
                 yield frame
                 frame_count += 1
     
+    def read_frame_batches(self, batch_size: int = 8,
+                           max_frames: Optional[int] = None) -> Iterator[List[np.ndarray]]:
+        """Yield lists of up to `batch_size` consecutive frames for batched inference.
+        
+        Frames are the decoder's own arrays (no stacking copy), so batches stay
+        valid after the next one is read and can be queued.
+        """
+        batch = []
+        for frame in self.read_frames(max_frames=max_frames):
+            batch.append(frame)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+    
     def get_metadata(self) -> Dict:
         return self.metadata
 
@@ -178,19 +263,41 @@ class VideoWriter:
                  crf: int = 18,
                  preset: str = 'p4',
                  audio_path: Optional[str] = None,
-                 metadata: Optional[Dict] = None):
-        
+                 metadata: Optional[Dict] = None,
+                 tune: Optional[str] = None,
+                 bitrate: Optional[str] = None):
+        """
+        Args:
+            tune: NVENC tuning (e.g. 'll'); ignored by libx264.
+            bitrate: NVENC constant bitrate (e.g. '8M') instead of CQ rate
+                control at `crf`; ignored by libx264.
+        """
+
         self.output_path = output_path
         self.width = width
         self.height = height
         self.fps = fps
-        self.codec = codec
+        self.codec = self._resolve_codec(codec)
         self.crf = crf
         self.preset = preset
+        self.tune = tune
+        self.bitrate = bitrate
         self.audio_path = audio_path
         self.metadata = metadata or {}
         self.process = None
+        self._stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        self._stderr_thread = None
         
+    @staticmethod
+    def _resolve_codec(codec: str) -> str:
+        """Downgrade an NVENC codec this FFmpeg build can't encode to libx264."""
+        if 'nvenc' not in codec or codec in nvenc_encoders():
+            return codec
+        if codec not in _warned_codecs:
+            _warned_codecs.add(codec)
+            logger.warning(f"{codec} not available, falling back to libx264")
+        return 'libx264'
+    
     def __enter__(self):
         self._start_encoder()
         return self
@@ -216,23 +323,7 @@ class VideoWriter:
             cmd.extend(['-i', self.audio_path, '-c:a', 'aac', '-b:a', '192k'])
         
         # Video encoding settings
-        if 'nvenc' in self.codec:
-            cmd.extend([
-                '-c:v', self.codec,
-                '-preset', self.preset,
-                '-rc', 'vbr',
-                '-cq', str(self.crf),
-                '-b:v', '0',
-                '-pix_fmt', 'yuv420p'
-            ])
-        else:
-            # Fallback to libx264
-            cmd.extend([
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', str(self.crf),
-                '-pix_fmt', 'yuv420p'
-            ])
+        cmd.extend(self._video_codec_args())
         
         # Preserve color metadata
         if 'color_space' in self.metadata and self.metadata['color_space'] != 'unknown':
@@ -251,11 +342,45 @@ class VideoWriter:
             stdin=subprocess.PIPE,
             stderr=subprocess.PIPE
         )
+        _grow_pipe(self.process.stdin)
+        
+        # Drain the encoder log as it arrives; a full stderr pipe would
+        # stall FFmpeg and with it every write_frame()
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+    
+    def _video_codec_args(self) -> List[str]:
+        """FFmpeg video encoder arguments for this writer's codec settings."""
+        if 'nvenc' in self.codec:
+            args = ['-c:v', self.codec, '-preset', self.preset]
+            if self.tune:
+                args.extend(['-tune', self.tune])
+            if self.bitrate:
+                args.extend(['-rc', 'cbr', '-b:v', self.bitrate])
+            else:
+                args.extend(['-rc', 'vbr', '-cq', str(self.crf), '-b:v', '0'])
+            return args + ['-pix_fmt', 'yuv420p']
+        
+        # Fallback to libx264
+        return [
+            '-c:v', 'libx264',
+            '-preset', 'medium',
+            '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p'
+        ]
+    
+    def _drain_stderr(self):
+        """Keep the last encoder log lines (runs on a background thread)."""
+        for line in iter(self.process.stderr.readline, b''):
+            self._stderr_tail.append(line)
     
     def write_frame(self, frame: np.ndarray):
         """Write a single frame."""
         if self.process and self.process.stdin:
-            self.process.stdin.write(frame.tobytes())
+            # Pipe writes take any buffer; only copy if the frame isn't contiguous
+            if not frame.flags['C_CONTIGUOUS']:
+                frame = np.ascontiguousarray(frame)
+            self.process.stdin.write(memoryview(frame))
     
     def _finish_encoder(self):
         """Close encoder and finalize file."""
@@ -263,25 +388,12 @@ class VideoWriter:
             if self.process.stdin:
                 self.process.stdin.close()
             self.process.wait()
+            if self._stderr_thread:
+                self._stderr_thread.join()
             
             # Log any errors
-            if self.process.stderr:
-                stderr = self.process.stderr.read().decode('utf-8', errors='ignore')
-                if self.process.returncode != 0:
-                    logger.error(f"Encoder errors: {stderr}")
-                else:
-                    logger.info("Encoding completed successfully")
-
-
-def check_nvenc_available() -> bool:
-    """Check if NVENC is available."""
-    try:
-        result = subprocess.run(
-            ['ffmpeg', '-hide_banner', '-encoders'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return 'h264_nvenc' in result.stdout or 'hevc_nvenc' in result.stdout
-    except:
-        return False
\ No newline at end of file
+            if self.process.returncode != 0:
+                stderr = b''.join(self._stderr_tail).decode('utf-8', errors='ignore')
+                logger.error(f"Encoder errors: {stderr}")
+            else:
+                logger.info("Encoding completed successfully")
@@ -1,18 +1,26 @@
 """Intelligent job queue manager with background processing."""
 
+import multiprocessing
+import os
 import threading
 import queue
 import time
 import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Callable, Optional
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
 import json
 
 logger = logging.getLogger(__name__)
 
+# Worker processes, each with its own single-slot executor (one per GPU)
+JOB_WORKERS = max(1, int(os.environ.get('JOB_WORKERS', '1')))
+
 
 @dataclass
 class Job:
@@ -29,111 +37,220 @@ class Job:
     fps: float = 0.0
     eta_seconds: float = 0.0
     error: Optional[str] = None
-    created_at: str = ''
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    # Epoch milliseconds; ISO strings are formatted on demand (see properties)
+    created_at_ms: int = 0
+    started_at_ms: Optional[int] = None
+    completed_at_ms: Optional[int] = None
     effect_intensity: float = 1.0
     
+    @property
+    def created_at(self) -> str:
+        return _format_ms(self.created_at_ms) or ''
+    
+    @property
+    def started_at(self) -> Optional[str]:
+        return _format_ms(self.started_at_ms)
+    
+    @property
+    def completed_at(self) -> Optional[str]:
+        return _format_ms(self.completed_at_ms)
+    
     def to_dict(self):
-        return asdict(self)
+        # Shallow copy of the flat fields; asdict() would deep-copy each one
+        d = {k: getattr(self, k) for k in _JOB_FIELDS}
+        d['styles'] = list(self.styles)
+        return d
 
 
-class JobManager:
-    """Manages job queue with background processing."""
+_JOB_FIELDS = tuple(f.name for f in fields(Job))
+
+
+def _now_ms() -> int:
+    """Current wall-clock time in epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _format_ms(ms: Optional[int]) -> Optional[str]:
+    """ISO-format an epoch-milliseconds timestamp (None/0 -> None)."""
+    return datetime.fromtimestamp(ms / 1000).isoformat() if ms else None
+
+
+def _run_job(job: Dict, progress_queue) -> Dict:
+    """Process one job in a worker process, streaming progress back to the manager."""
+    # Import here to avoid circular imports (and keep the manager process light)
+    from .video_processor import VideoProcessor
     
-    _instance = None
-    _lock = threading.Lock()
+    job_id = job['id']
+    progress_queue.put((job_id, 'started', _now_ms()))
     
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+    # Create processor
+    processor = VideoProcessor(
+        input_path=job['input_path'],
+        output_dir=job['output_path'],
+        styles=job['styles'],
+        preset=job['preset'],
+        effect_intensity=job['effect_intensity']
+    )
+    
+    # Process with progress callback
+    def progress_callback(current, total, fps):
+        progress_queue.put((job_id, 'progress', (current, total, fps)))
+    
+    return processor.process(progress_callback=progress_callback)
+
+
+class _JobManager:
+    """Manages job queue with background processing."""
     
     def __init__(self):
-        if not hasattr(self, 'initialized'):
-            self.jobs: Dict[str, Job] = {}
-            self.job_queue = queue.Queue()
-            self.worker_thread = None
-            self.is_running = False
-            self.initialized = True
-            self._start_worker()
+        self.jobs: Dict[str, Job] = {}
+        self.futures: Dict[str, Future] = {}
+        self.executors: List[ProcessPoolExecutor] = []
+        self.worker_thread = None
+        self.is_running = False
+        # Guards worker startup and dispatch state
+        self._lock = threading.Lock()
     
     def _start_worker(self):
-        """Start background worker thread."""
+        """Start worker processes and the thread that applies their progress (on first job)."""
         if not self.is_running:
             self.is_running = True
+            # Spawned (not forked) workers: the server process runs many threads
+            ctx = multiprocessing.get_context('spawn')
+            self._mp_manager = ctx.Manager()
+            self.progress_queue = self._mp_manager.Queue()
+            self.executors = [ProcessPoolExecutor(max_workers=1, mp_context=ctx)
+                              for _ in range(JOB_WORKERS)]
+            # Per-worker pending job ids; idle workers steal from the others
+            self.queues = [queue.SimpleQueue() for _ in range(JOB_WORKERS)]
+            self._busy = [False] * JOB_WORKERS
+            self._next_queue = 0
+            # Jobs run per executor, so each worker's counters live apart
+            self.worker_stats = [{'submitted': 0, 'completed': 0, 'failed': 0}
+                                 for _ in range(JOB_WORKERS)]
+            
             self.worker_thread = threading.Thread(target=self._worker, daemon=True)
             self.worker_thread.start()
-            logger.info("Job worker thread started")
+            logger.info(f"Job workers started ({JOB_WORKERS} process(es))")
     
     def _worker(self):
-        """Background worker that processes jobs."""
+        """Background thread that applies progress reported by worker processes."""
         while self.is_running:
             try:
-                job_id = self.job_queue.get(timeout=1.0)
-                if job_id:
-                    self._process_job(job_id)
-                self.job_queue.task_done()
+                job_id, kind, payload = self.progress_queue.get(timeout=1.0)
             except queue.Empty:
                 continue
+            except (EOFError, OSError):
+                # Manager process went away (shutdown)
+                break
+            
+            # Messages can trail the job's completion; never reopen a finished job
+            job = self.jobs.get(job_id)
+            if not job or job.status not in ('Queued', 'Processing'):
+                continue
+            
+            try:
+                if kind == 'started':
+                    job.status = 'Processing'
+                    job.started_at_ms = payload
+                elif kind == 'progress':
+                    self._apply_progress(job, *payload)
             except Exception as e:
                 logger.error(f"Worker error: {e}")
     
-    def _process_job(self, job_id: str):
-        """Process a single job."""
+    @staticmethod
+    def _apply_progress(job: Job, current: int, total: int, fps: float):
+        """Update a job's progress fields."""
+        job.current_frame = current
+        job.total_frames = total
+        job.progress = (current / total) * 100 if total > 0 else 0
+        job.fps = fps
+        
+        # Calculate ETA
+        if fps > 0 and total > current:
+            remaining_frames = total - current
+            job.eta_seconds = remaining_frames / fps
+    
+    def _take_job(self, worker: int) -> Optional[str]:
+        """Next runnable job id from the worker's own queue, else stolen from another."""
+        n = len(self.queues)
+        for i in range(n):
+            q = self.queues[(worker + i) % n]
+            while True:
+                try:
+                    job_id = q.get_nowait()
+                except queue.Empty:
+                    break
+                job = self.jobs.get(job_id)
+                if job and job.status == 'Queued':
+                    return job_id
+        return None
+    
+    def _dispatch(self):
+        """Hand queued jobs to idle workers (one job per worker process at a time)."""
+        assignments = []
+        with self._lock:
+            for worker, busy in enumerate(self._busy):
+                if not busy:
+                    job_id = self._take_job(worker)
+                    if job_id:
+                        self._busy[worker] = True
+                        assignments.append((worker, job_id))
+        
+        for worker, job_id in assignments:
+            self._submit(worker, job_id)
+    
+    def _submit(self, worker: int, job_id: str):
+        """Start a job on a worker process."""
+        job = self.jobs[job_id]
+        try:
+            future = self.executors[worker].submit(_run_job, job.to_dict(), self.progress_queue)
+        except BrokenProcessPool:
+            # A worker process died (e.g. crashed in a codec); replace it
+            logger.warning(f"Restarting job worker {worker}")
+            self.executors[worker] = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+            future = self.executors[worker].submit(_run_job, job.to_dict(), self.progress_queue)
+        self.futures[job_id] = future
+        self.worker_stats[worker]['submitted'] += 1
+        future.add_done_callback(partial(self._finalize, job_id, worker))
+    
+    def _finalize(self, job_id: str, worker: int, future: Future):
+        """Record a finished job's outcome and give the worker its next job."""
+        self.futures.pop(job_id, None)
+        self._record_result(job_id, worker, future)
+        with self._lock:
+            self._busy[worker] = False
+        self._dispatch()
+    
+    def _record_result(self, job_id: str, worker: int, future: Future):
+        """Update a job from its completed future."""
         job = self.jobs.get(job_id)
-        if not job:
+        if not job or job.status == 'Cancelled':
             return
         
         try:
-            # Update status
-            job.status = 'Processing'
-            job.started_at = datetime.now().isoformat()
-            
-            # Import here to avoid circular imports
-            from .video_processor import VideoProcessor
-            
-            # Create processor
-            processor = VideoProcessor(
-                input_path=job.input_path,
-                output_dir=job.output_path,
-                styles=job.styles,
-                preset=job.preset,
-                effect_intensity=job.effect_intensity
-            )
-            
-            # Process with progress callback
-            def progress_callback(current, total, fps):
-                job.current_frame = current
-                job.total_frames = total
-                job.progress = (current / total) * 100 if total > 0 else 0
-                job.fps = fps
-                
-                # Calculate ETA
-                if fps > 0 and total > current:
-                    remaining_frames = total - current
-                    job.eta_seconds = remaining_frames / fps
-            
-            # Process video
-            result = processor.process(progress_callback=progress_callback)
+            result = future.result()
             
             # Update status
             if result['success']:
                 job.status = 'Completed'
                 job.progress = 100.0
+                self.worker_stats[worker]['completed'] += 1
             else:
                 job.status = 'Failed'
                 job.error = result.get('error', 'Unknown error')
+                self.worker_stats[worker]['failed'] += 1
             
-            job.completed_at = datetime.now().isoformat()
-            
+        except CancelledError:
+            return
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}")
             job.status = 'Failed'
             job.error = str(e)
-            job.completed_at = datetime.now().isoformat()
+            self.worker_stats[worker]['failed'] += 1
+        
+        job.completed_at_ms = _now_ms()
     
     def add_job(self, input_path: str, output_path: str, styles: List[str], 
                 preset: str, effect_intensity: float = 1.0) -> str:
@@ -147,11 +264,17 @@ class JobManager:
             styles=styles,
             preset=preset,
             effect_intensity=effect_intensity,
-            created_at=datetime.now().isoformat()
+            created_at_ms=_now_ms()
         )
         
         self.jobs[job_id] = job
-        self.job_queue.put(job_id)
+        
+        with self._lock:
+            self._start_worker()
+            # Round-robin over the per-worker queues
+            self.queues[self._next_queue].put(job_id)
+            self._next_queue = (self._next_queue + 1) % len(self.queues)
+        self._dispatch()
         
         logger.info(f"Job {job_id} added to queue")
         return job_id
@@ -169,6 +292,11 @@ class JobManager:
         job = self.jobs.get(job_id)
         if job and job.status in ['Queued', 'Processing']:
             job.status = 'Cancelled'
+            # Queued jobs are skipped by the dispatcher; a running job
+            # finishes but its result is ignored
+            future = self.futures.get(job_id)
+            if future:
+                future.cancel()
             logger.info(f"Job {job_id} cancelled")
     
     def clear_completed(self):
@@ -180,8 +308,18 @@ class JobManager:
         logger.info(f"Cleared {len(to_remove)} completed jobs")
     
     def shutdown(self):
-        """Shutdown worker thread."""
+        """Shutdown worker processes and the progress thread."""
         self.is_running = False
         if self.worker_thread:
             self.worker_thread.join(timeout=5.0)
-        logger.info("Job manager shutdown")
\ No newline at end of file
+        for executor in self.executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self.executors:
+            self._mp_manager.shutdown()
+        logger.info("Job manager shutdown")
+
+
+@lru_cache(maxsize=None)
+def JobManager() -> _JobManager:
+    """The process-wide job manager (created on first call)."""
+    return _JobManager()
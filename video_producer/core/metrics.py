@@ -2,11 +2,33 @@
 
 import numpy as np
 import cv2
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import time
 from pathlib import Path
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Side of the uniform SSIM window (skimage's default)
+SSIM_WINDOW = 7
+
+# Per-frame numeric metrics, stored column-wise
+METRIC_COLUMNS = {
+    'frame_idx': np.int64,
+    'processing_time': np.float64,
+    'edge_coherence': np.float64,
+    'ssim': np.float64,
+    'mse': np.float64,
+    'sharpness': np.float64,
+}
+
+# Initial column capacity (doubles when full)
+INITIAL_CAPACITY = 1024
+
 
 class MetricsCollector:
     """Collect processing metrics for ML learning."""
@@ -14,7 +36,30 @@ class MetricsCollector:
     def __init__(self, output_dir: str = "logs/metrics"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.metrics_log = []
+        self._cols = {k: np.empty(INITIAL_CAPACITY, dtype=t) for k, t in METRIC_COLUMNS.items()}
+        self._styles = []
+        self._n = 0
+    
+    @property
+    def metrics_log(self) -> List[Dict]:
+        """Logged frames as one dict per frame (built on demand)."""
+        cols = {k: v[:self._n].tolist() for k, v in self._cols.items()}
+        cols['style'] = self._styles
+        keys = ('frame_idx', 'style') + tuple(METRIC_COLUMNS)[1:]
+        return [dict(zip(keys, row)) for row in zip(*(cols[k] for k in keys))]
+    
+    def _append(self, metrics: Dict):
+        """Write one frame's metrics into the columns, growing them when full."""
+        if self._n == len(self._cols['ssim']):
+            for k, col in self._cols.items():
+                grown = np.empty(2 * len(col), dtype=col.dtype)
+                grown[:self._n] = col
+                self._cols[k] = grown
+        
+        for k, col in self._cols.items():
+            col[self._n] = metrics[k]
+        self._styles.append(metrics['style'])
+        self._n += 1
     
     def collect_frame_metrics(self, 
                              original: np.ndarray,
@@ -23,60 +68,92 @@ class MetricsCollector:
                              frame_idx: int,
                              processing_time: float) -> Dict:
         """Collect metrics for a single frame."""
+        edge_coherence, ssim, mse, sharpness = self._compute_all(original, processed)
         metrics = {
             'frame_idx': frame_idx,
             'style': style,
             'processing_time': processing_time,
-            'edge_coherence': self._edge_coherence(processed),
-            'ssim': self._ssim(original, processed),
-            'mse': self._mse(original, processed),
-            'sharpness': self._sharpness(processed)
+            'edge_coherence': edge_coherence,
+            'ssim': ssim,
+            'mse': mse,
+            'sharpness': sharpness
         }
         
-        self.metrics_log.append(metrics)
+        self._append(metrics)
         return metrics
     
-    def _edge_coherence(self, img: np.ndarray) -> float:
+    def _compute_all(self, original: np.ndarray, processed: np.ndarray) -> Tuple[float, float, float, float]:
+        """(edge coherence, SSIM, MSE, sharpness) with one gray conversion per image."""
+        gray_o = cv2.cvtColor(original, cv2.COLOR_RGB2GRAY)
+        gray_p = cv2.cvtColor(processed, cv2.COLOR_RGB2GRAY)
+        
+        return (self._edge_coherence(gray_p),
+                self._ssim(gray_o, gray_p),
+                self._mse(original, processed),
+                self._sharpness(gray_p))
+    
+    def _edge_coherence(self, gray: np.ndarray) -> float:
         """Measure edge coherence (higher = more edges)."""
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
         edges = cv2.Canny(gray, 50, 150)
-        return np.sum(edges > 0) / edges.size
+        return cv2.countNonZero(edges) / edges.size
     
-    def _ssim(self, img1: np.ndarray, img2: np.ndarray) -> float:
-        """Calculate SSIM."""
-        from skimage.metrics import structural_similarity
+    def _ssim(self, gray1: np.ndarray, gray2: np.ndarray) -> float:
+        """Calculate SSIM of two uint8 gray images.
+        
+        Same definition as skimage's `structural_similarity` defaults: 7x7
+        uniform window, sample covariance, border of half a window cropped.
+        """
+        win = SSIM_WINDOW
+        x = gray1.astype(np.float32)
+        y = gray2.astype(np.float32)
+        
+        # Local means and (co)variances from box filters
+        def mean(img):
+            return cv2.boxFilter(img, -1, (win, win), borderType=cv2.BORDER_REFLECT)
+        
+        ux, uy = mean(x), mean(y)
+        cov_norm = win * win / (win * win - 1.0)
+        vx = cov_norm * (mean(x * x) - ux * ux)
+        vy = cov_norm * (mean(y * y) - uy * uy)
+        vxy = cov_norm * (mean(x * y) - ux * uy)
         
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(img1, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(img2, cv2.COLOR_RGB2GRAY)
+        c1 = (0.01 * 255) ** 2
+        c2 = (0.03 * 255) ** 2
+        s = ((2 * ux * uy + c1) * (2 * vxy + c2)) / ((ux * ux + uy * uy + c1) * (vx + vy + c2))
         
-        return structural_similarity(gray1, gray2)
+        pad = (win - 1) // 2
+        return float(s[pad:-pad, pad:-pad].mean(dtype=np.float64))
     
     def _mse(self, img1: np.ndarray, img2: np.ndarray) -> float:
         """Calculate MSE."""
-        return np.mean((img1.astype(float) - img2.astype(float)) ** 2)
+        # Sum of squared differences without float64 temporaries
+        return cv2.norm(img1, img2, cv2.NORM_L2SQR) / img1.size
     
-    def _sharpness(self, img: np.ndarray) -> float:
+    def _sharpness(self, gray: np.ndarray) -> float:
         """Measure sharpness using Laplacian variance."""
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        return laplacian.var()
+        laplacian = cv2.Laplacian(gray, cv2.CV_32F)
+        _, std = cv2.meanStdDev(laplacian)
+        return float(std[0, 0] ** 2)
     
     def save_metrics(self, job_id: str):
         """Save metrics to file."""
         output_file = self.output_dir / f"{job_id}_metrics.json"
-        with open(output_file, 'w') as f:
-            json.dump(self.metrics_log, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(self.metrics_log, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(self.metrics_log, indent=2).encode('utf-8')
+        output_file.write_bytes(data)
     
     def get_summary(self) -> Dict:
         """Get summary statistics."""
-        if not self.metrics_log:
+        if not self._n:
             return {}
         
+        n = self._n
         return {
-            'avg_processing_time': np.mean([m['processing_time'] for m in self.metrics_log]),
-            'avg_edge_coherence': np.mean([m['edge_coherence'] for m in self.metrics_log]),
-            'avg_ssim': np.mean([m['ssim'] for m in self.metrics_log]),
-            'avg_sharpness': np.mean([m['sharpness'] for m in self.metrics_log]),
-            'total_frames': len(self.metrics_log)
+            'avg_processing_time': self._cols['processing_time'][:n].mean(),
+            'avg_edge_coherence': self._cols['edge_coherence'][:n].mean(),
+            'avg_ssim': self._cols['ssim'][:n].mean(),
+            'avg_sharpness': self._cols['sharpness'][:n].mean(),
+            'total_frames': n
         }
\ No newline at end of file
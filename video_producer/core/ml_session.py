@@ -1,46 +1,158 @@
 """ML inference session with ONNX Runtime."""
 
 import numpy as np
-import onnxruntime as ort
-from typing import Optional, List
+import cv2
+import importlib.util
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, List, Sequence, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# numba is imported (and kernels compiled) on first tiled inference
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+
+@lru_cache(maxsize=1)
+def _tile_kernels():
+    """(accumulate, normalize) Numba kernels (imports numba on first call)."""
+    from numba import njit, prange
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _accumulate_tile_numba(out, wmap, tile, weight, y1, x1):
+        """Weighted tile accumulation into `out`/`wmap`, one pass, in place."""
+        for i in prange(tile.shape[0]):
+            for j in range(tile.shape[1]):
+                w = weight[i, j]
+                for c in range(tile.shape[2]):
+                    out[y1 + i, x1 + j, c] += tile[i, j, c] * w
+                wmap[y1 + i, x1 + j] += w
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_numba(acc, wmap, out):
+        """Divide the accumulator by the weights and saturate to uint8."""
+        for y in prange(acc.shape[0]):
+            for x in range(acc.shape[1]):
+                inv = 1.0 / max(wmap[y, x], 1e-6)
+                for c in range(acc.shape[2]):
+                    out[y, x, c] = np.uint8(min(max(acc[y, x, c] * inv, 0.0), 255.0))
+    
+    return _accumulate_tile_numba, _normalize_numba
+
+
+# Tiles (or small images) per session run in batched inference
+TILE_BATCH_SIZE = 8
+
+# Model precisions MLSession can run ('auto' = fp16 on CUDA, else fp32)
+PRECISIONS = ('auto', 'fp32', 'fp16', 'int8')
+
+# (source path, source mtime_ns, precision) conversions that failed; not retried
+_failed_conversions = set()
+
 
 class MLSession:
     """ONNX Runtime session manager."""
     
-    def __init__(self, model_path: str, use_gpu: bool = True):
+    def __init__(self, model_path: str, use_gpu: bool = True, precision: str = 'fp32'):
+        """
+        Args:
+            precision: One of PRECISIONS. Reduced-precision models are opt-in,
+                converted once and cached next to the original.
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
         self.model_path = model_path
         self.use_gpu = use_gpu
+        self.precision = precision
         self.session = None
+        self._input_name = None
+        self._output_name = None
+        self._input_dtype = np.float32
+        self._binding = None
+        self._device = None
+        self._device_input = None
+        # The IOBinding and its device buffers are shared state; session.run itself is thread-safe
+        self._binding_lock = threading.Lock()
         self._init_session()
     
     def _init_session(self):
         """Initialize ONNX Runtime session."""
+        # Imported here so `import core` stays cheap until a model is loaded
+        import onnxruntime as ort
+        
         providers = self._get_providers()
         
+        precision = self.precision
+        if precision == 'auto':
+            precision = 'fp16' if 'CUDAExecutionProvider' in providers else 'fp32'
+        model_path = self._converted_model(precision)
+        
         try:
             self.session = ort.InferenceSession(
-                self.model_path,
+                model_path,
                 providers=providers
             )
             
-            logger.info(f"Loaded model: {self.model_path}")
+            logger.info(f"Loaded model: {model_path}")
             logger.info(f"Providers: {self.session.get_providers()}")
             
-            # Log input/output info
-            input_name = self.session.get_inputs()[0].name
-            input_shape = self.session.get_inputs()[0].shape
-            logger.info(f"Input: {input_name} {input_shape}")
+            # Resolve input/output names once instead of per infer()
+            model_input = self.session.get_inputs()[0]
+            self._input_name = model_input.name
+            self._output_name = self.session.get_outputs()[0].name
+            self._input_dtype = np.float16 if model_input.type == 'tensor(float16)' else np.float32
+            logger.info(f"Input: {self._input_name} {model_input.shape} {model_input.type}")
+            
+            if 'CUDAExecutionProvider' in self.session.get_providers():
+                self._init_binding('cuda')
             
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def _converted_model(self, precision: str) -> str:
+        """Path of the model at `precision`, converting (and caching) on first use.
+        
+        Falls back to the original FP32 model if conversion fails.
+        """
+        if precision == 'fp32':
+            return self.model_path
+        
+        source = Path(self.model_path)
+        target = source.with_name(f"{source.stem}.{precision}{source.suffix}")
+        if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+            return str(target)
+        
+        key = (str(source.resolve()), source.stat().st_mtime_ns, precision)
+        if key in _failed_conversions:
+            return self.model_path
+        
+        try:
+            if precision == 'fp16':
+                import onnx
+                from onnxruntime.transformers.float16 import convert_float_to_float16
+                
+                model = convert_float_to_float16(onnx.load(str(source)), keep_io_types=False)
+                onnx.save(model, str(target))
+            else:
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                
+                quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+        except Exception as e:
+            logger.warning(f"{precision} conversion failed, using FP32 model: {e}")
+            _failed_conversions.add(key)
+            target.unlink(missing_ok=True)
+            return self.model_path
+        
+        logger.info(f"Converted model to {precision}: {target}")
+        return str(target)
+    
     def _get_providers(self) -> List[str]:
         """Get available execution providers."""
+        import onnxruntime as ort
+        
         available = ort.get_available_providers()
         
         if self.use_gpu and 'CUDAExecutionProvider' in available:
@@ -48,100 +160,197 @@ class MLSession:
         else:
             return ['CPUExecutionProvider']
     
+    def _init_binding(self, device: str):
+        """Bind input/output to `device` so every tile reuses one device buffer."""
+        self._binding = self.session.io_binding()
+        self._binding.bind_output(self._output_name, device)
+        self._device = device
+        self._device_input = None
+    
     def infer(self, input_data: np.ndarray) -> np.ndarray:
         """Run inference."""
         if self.session is None:
             raise RuntimeError("Session not initialized")
         
-        input_name = self.session.get_inputs()[0].name
-        output_name = self.session.get_outputs()[0].name
+        if self._binding is not None:
+            return self._infer_bound(input_data)
         
         result = self.session.run(
-            [output_name],
-            {input_name: input_data}
+            [self._output_name],
+            {self._input_name: input_data}
         )
         
         return result[0]
     
+    def _infer_bound(self, input_data: np.ndarray) -> np.ndarray:
+        """Run through the IOBinding, uploading into the persistent device input."""
+        import onnxruntime as ort
+        
+        input_data = np.ascontiguousarray(input_data, dtype=self._input_dtype)
+        
+        # Concurrent callers (e.g. Pipeline parallel_chunks) take turns on the binding
+        with self._binding_lock:
+            # Reallocate only when the shape changes (e.g. a smaller final batch)
+            if self._device_input is None or self._device_input.shape() != list(input_data.shape):
+                self._device_input = ort.OrtValue.ortvalue_from_numpy(input_data, self._device, 0)
+                self._binding.bind_ortvalue_input(self._input_name, self._device_input)
+                # The output kept from the last run has the old shape
+                self._binding.bind_output(self._output_name, self._device)
+            else:
+                self._device_input.update_inplace(input_data)
+            
+            self.session.run_with_iobinding(self._binding)
+            return self._binding.copy_outputs_to_cpu()[0]
+    
     def infer_tiled(self, 
                     img: np.ndarray,
                     tile_size: int = 512,
                     overlap: int = 32) -> np.ndarray:
         """Infer with tiling for large images."""
-        h, w = img.shape[:2]
+        return self.infer_tiled_batch([img], tile_size, overlap)[0]
+    
+    def infer_tiled_batch(self,
+                          imgs: Sequence[np.ndarray],
+                          tile_size: int = 512,
+                          overlap: int = 32,
+                          max_batch: int = TILE_BATCH_SIZE) -> List[np.ndarray]:
+        """Infer same-sized images, batching their tiles across images.
         
-        # If image fits in tile, process directly
-        if h <= tile_size and w <= tile_size:
-            return self._infer_single(img)
+        Tiles from every image go through the session `max_batch` at a time,
+        so large frames are batched too, not just ones that fit in a tile.
+        """
+        h, w = imgs[0].shape[:2]
         
-        # Process with overlapping tiles
-        output = np.zeros_like(img)
-        weight_map = np.zeros((h, w), dtype=np.float32)
+        # If images fit in a tile, process them directly
+        if h <= tile_size and w <= tile_size:
+            return [result for start in range(0, len(imgs), max_batch)
+                    for result in self.infer_batch(imgs[start:start + max_batch])]
         
+        # Tile grid (same for every image)
         stride = tile_size - overlap
+        boxes = [(y, min(y + tile_size, h), x, min(x + tile_size, w))
+                 for y in range(0, h, stride) for x in range(0, w, stride)]
         
-        for y in range(0, h, stride):
-            for x in range(0, w, stride):
-                # Extract tile
-                y1 = y
-                y2 = min(y + tile_size, h)
-                x1 = x
-                x2 = min(x + tile_size, w)
-                
-                tile = img[y1:y2, x1:x2]
+        # Process with overlapping tiles into float32 accumulators
+        outputs = [np.zeros(img.shape, dtype=np.float32) for img in imgs]
+        weight_maps = [np.zeros((h, w), dtype=np.float32) for _ in imgs]
+        jobs = [(i, box) for i in range(len(imgs)) for box in boxes]
+        
+        for start in range(0, len(jobs), max_batch):
+            chunk = jobs[start:start + max_batch]
+            
+            tiles = []
+            for i, (y1, y2, x1, x2) in chunk:
+                tile = imgs[i][y1:y2, x1:x2]
                 
                 # Pad if needed
                 pad_h = tile_size - tile.shape[0]
                 pad_w = tile_size - tile.shape[1]
                 if pad_h > 0 or pad_w > 0:
                     tile = np.pad(tile, ((0, pad_h), (0, pad_w), (0, 0)), mode='reflect')
-                
-                # Process tile
-                result_tile = self._infer_single(tile)
-                
+                tiles.append(tile)
+            
+            # Process tiles in one session run
+            results = self.infer_batch(tiles)
+            
+            for (i, (y1, y2, x1, x2)), result_tile in zip(chunk, results):
                 # Remove padding
                 result_tile = result_tile[:y2-y1, :x2-x1]
                 
-                # Blend with feathering
-                weight = self._create_weight_map(result_tile.shape[0], result_tile.shape[1], overlap)
+                # Blend with feathering, only towards neighbouring tiles (image
+                # borders keep full weight); one cached map per tile position kind
+                weight = self._create_weight_map(
+                    result_tile.shape[0], result_tile.shape[1], overlap,
+                    sides=(y1 > 0, x1 > 0, y2 < h, x2 < w))
                 
-                output[y1:y2, x1:x2] += result_tile * weight[:, :, np.newaxis]
-                weight_map[y1:y2, x1:x2] += weight
+                output, weight_map = outputs[i], weight_maps[i]
+                if NUMBA_AVAILABLE:
+                    accumulate, _ = _tile_kernels()
+                    accumulate(output, weight_map, np.ascontiguousarray(result_tile), weight, y1, x1)
+                else:
+                    output[y1:y2, x1:x2] += result_tile * weight[:, :, np.newaxis]
+                    weight_map[y1:y2, x1:x2] += weight
         
-        # Normalize by weight
-        weight_map = np.maximum(weight_map, 1e-6)
-        output = output / weight_map[:, :, np.newaxis]
+        return [self._normalize(output, weight_map)
+                for output, weight_map in zip(outputs, weight_maps)]
+    
+    @staticmethod
+    def _normalize(output: np.ndarray, weight_map: np.ndarray) -> np.ndarray:
+        """Divide accumulated tiles by their summed weights, as uint8."""
+        if NUMBA_AVAILABLE:
+            result = np.empty(output.shape, dtype=np.uint8)
+            _, normalize = _tile_kernels()
+            normalize(output, weight_map, result)
+            return result
         
+        np.maximum(weight_map, 1e-6, out=weight_map)
+        output /= weight_map[:, :, np.newaxis]
+        np.clip(output, 0, 255, out=output)
         return output.astype(np.uint8)
     
-    def _infer_single(self, img: np.ndarray) -> np.ndarray:
-        """Infer single image (internal helper)."""
-        # Prepare input (NCHW format)
-        input_data = img.astype(np.float32) / 255.0
-        input_data = np.transpose(input_data, (2, 0, 1))
-        input_data = np.expand_dims(input_data, axis=0)
+    def infer_batch(self, imgs: Sequence[np.ndarray]) -> np.ndarray:
+        """Infer a (B, H, W, 3) uint8 batch (or list of frames) in a single session run."""
+        # Prepare input (NCHW float in [0, 1]) in one pass
+        input_data = cv2.dnn.blobFromImages(list(imgs), scalefactor=1.0 / 255.0)
         
         # Infer
-        output = self.infer(input_data)
+        output = self.infer(input_data.astype(self._input_dtype, copy=False))
+        if output.dtype != np.float32:
+            output = output.astype(np.float32)
         
-        # Convert back (NHWC)
-        output = np.squeeze(output, axis=0)
-        output = np.transpose(output, (1, 2, 0))
-        output = np.clip(output * 255.0, 0, 255).astype(np.uint8)
+        # Convert back (NHWC): interleave planes, then scale and clip in place
+        result = np.empty((output.shape[0], output.shape[2], output.shape[3], output.shape[1]),
+                          dtype=np.uint8)
+        for i, planes in enumerate(output):
+            hwc = cv2.merge(list(planes))
+            np.clip(hwc, 0, 1, out=hwc)
+            hwc *= 255.0
+            result[i] = hwc
         
-        return output
+        return result
     
-    def _create_weight_map(self, h: int, w: int, overlap: int) -> np.ndarray:
-        """Create feathering weight map."""
-        weight = np.ones((h, w), dtype=np.float32)
-        
-        # Feather edges
-        if overlap > 0:
-            for i in range(overlap):
-                alpha = i / overlap
-                weight[i, :] = alpha
-                weight[-i-1, :] = alpha
-                weight[:, i] = alpha
-                weight[:, -i-1] = alpha
+    def _infer_single(self, img: np.ndarray) -> np.ndarray:
+        """Infer single image (internal helper)."""
+        return self.infer_batch(img[np.newaxis])[0]
+    
+    def _create_weight_map(self, h: int, w: int, overlap: int,
+                           sides: Tuple[bool, bool, bool, bool] = (True, True, True, True)
+                           ) -> np.ndarray:
+        """Create feathering weight map (shared and read-only; don't modify).
         
-        return weight
\ No newline at end of file
+        `sides` (top, left, bottom, right) selects which edges ramp down.
+        """
+        return _feather_weights(h, w, overlap, sides)
+
+
+def _edge_ramp(n: int, overlap: int, start: bool, end: bool) -> np.ndarray:
+    """1-D weights ramping 0 -> 1 over `overlap` samples from the selected ends."""
+    d = np.arange(n, dtype=np.float32)
+    ramp = np.ones(n, dtype=np.float32)
+    if start:
+        np.minimum(ramp, d / overlap, out=ramp)
+    if end:
+        np.minimum(ramp, (n - 1 - d) / overlap, out=ramp)
+    return ramp
+
+
+@lru_cache(maxsize=32)
+def _feather_weights(h: int, w: int, overlap: int,
+                     sides: Tuple[bool, bool, bool, bool] = (True, True, True, True)) -> np.ndarray:
+    """Weights ramping 0 -> 1 over `overlap` pixels from each selected edge.
+    
+    `sides` is (top, left, bottom, right). Tiles of one image only come in a
+    handful of size/side combinations, so after the first few tiles every
+    map is a cache hit.
+    """
+    if overlap <= 0:
+        weight = np.ones((h, w), dtype=np.float32)
+    else:
+        # Distance to the nearest ramped edge along each axis, as a clipped ramp
+        top, left, bottom, right = sides
+        wy = _edge_ramp(h, overlap, top, bottom)
+        wx = _edge_ramp(w, overlap, left, right)
+        weight = np.minimum(wy[:, np.newaxis], wx[np.newaxis, :])
+    
+    weight.flags.writeable = False
+    return weight
@@ -0,0 +1,10 @@
+"""Output naming helpers (kept free of heavy imports for the UI)."""
+
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def style_slug(style: str) -> str:
+    """Filename-safe slug for a style name (e.g. 'Comic/Halftone' -> 'comic_halftone')."""
+    return re.sub(r'[^a-z0-9]+', '_', style.lower()).strip('_')
@@ -7,69 +7,127 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# OpenCV CUDA filters are only present in CUDA-enabled builds
+try:
+    CV2_CUDA_AVAILABLE = (cv2.cuda.getCudaEnabledDeviceCount() > 0
+                          and hasattr(cv2.cuda, 'createLaplacianFilter'))
+except (AttributeError, cv2.error):
+    CV2_CUDA_AVAILABLE = False
+
+# Sample frames are analyzed at this longest side at most
+MAX_ANALYSIS_SIDE = 512
+
+# Style-name substring -> parameter optimizer method (checked in order)
+STYLE_OPTIMIZERS = {
+    'Pencil': '_optimize_pencil',
+    'Cartoon': '_optimize_cartoon',
+    'Comic': '_optimize_comic',
+    'Cinematic': '_optimize_cinematic',
+}
+
 
 class PatternLearner:
     """Learns from video patterns to optimize processing parameters."""
     
-    def __init__(self):
+    def __init__(self, use_gpu: bool = True):
         self.learned_patterns = {}
+        # GPU edge/noise stats only pay off when analysis is repeated (e.g.
+        # per-chunk re-analysis); filters are created once and reused
+        self.use_gpu = use_gpu and CV2_CUDA_AVAILABLE
+        self._gpu_filters = None
     
     def analyze_video(self, sample_frames: List[np.ndarray]) -> Dict:
         """Analyze video characteristics from sample frames."""
         if not sample_frames:
             return self._get_default_characteristics()
         
-        characteristics = {
-            'brightness': 0.0,
-            'contrast': 0.0,
-            'edge_density': 0.0,
-            'color_richness': 0.0,
-            'noise_level': 0.0,
-            'motion_estimate': 0.0
-        }
+        # Statistics don't need full resolution; analyze all samples as one stack
+        small = np.stack([self._downsample(frame) for frame in sample_frames])
+        n_frames, h, w = small.shape[:3]
+        gray = cv2.cvtColor(small.reshape(n_frames * h, w, 3), cv2.COLOR_RGB2GRAY)
+        gray = gray.reshape(n_frames, h, w)
+        
+        # Edge density and noise level (high-frequency content) per frame
+        edge_density, noise_level = 0.0, 0.0
+        if self.use_gpu:
+            try:
+                edge_density, noise_level = self._high_freq_stats_gpu(gray)
+            except cv2.error as e:
+                logger.warning(f"GPU analysis failed, using CPU: {e}")
+                self.use_gpu = False
+        if not self.use_gpu:
+            for g in gray:
+                edge_density += cv2.countNonZero(cv2.Canny(g, 50, 150)) / g.size
+                _, std = cv2.meanStdDev(cv2.Laplacian(g, cv2.CV_32F))
+                noise_level += std[0, 0] ** 2 / 10000.0
         
-        # Analyze each frame
-        for frame in sample_frames:
+        characteristics = {
             # Brightness (mean luminance)
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            characteristics['brightness'] += np.mean(gray) / 255.0
-            
+            'brightness': gray.mean() / 255.0,
             # Contrast (std of luminance)
-            characteristics['contrast'] += np.std(gray) / 128.0
-            
-            # Edge density
-            edges = cv2.Canny(gray, 50, 150)
-            characteristics['edge_density'] += np.sum(edges > 0) / edges.size
-            
+            'contrast': gray.reshape(n_frames, -1).std(axis=1).mean() / 128.0,
+            'edge_density': edge_density / n_frames,
             # Color richness (color variance)
-            color_std = np.mean([np.std(frame[:,:,c]) for c in range(3)])
-            characteristics['color_richness'] += color_std / 128.0
-            
-            # Noise level (high-frequency content)
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-            characteristics['noise_level'] += np.var(laplacian) / 10000.0
-        
-        # Average across frames
-        n_frames = len(sample_frames)
+            'color_richness': small.reshape(n_frames, -1, 3).std(axis=1).mean() / 128.0,
+            'noise_level': noise_level / n_frames,
+            'motion_estimate': 0.0
+        }
+        
         for key in characteristics:
-            characteristics[key] /= n_frames
-            characteristics[key] = np.clip(characteristics[key], 0.0, 1.0)
+            characteristics[key] = float(np.clip(characteristics[key], 0.0, 1.0))
         
         return characteristics
     
+    def _high_freq_stats_gpu(self, gray: np.ndarray):
+        """Summed edge density and Laplacian variance over frames, on the GPU.
+
+        The whole stack is uploaded once; each frame is a GpuMat ROI of it.
+        """
+        n_frames, h, w = gray.shape
+        if self._gpu_filters is None:
+            self._gpu_filters = (
+                cv2.cuda.createCannyEdgeDetector(50, 150),
+                # CUDA Laplacian requires matching src/dst types
+                cv2.cuda.createLaplacianFilter(cv2.CV_32F, cv2.CV_32F, ksize=1),
+            )
+        canny, laplacian = self._gpu_filters
+        
+        stack = cv2.cuda_GpuMat()
+        stack.upload(gray.reshape(n_frames * h, w))
+        stack_f = stack.convertTo(cv2.CV_32F)
+        
+        edge_density = 0.0
+        noise_level = 0.0
+        n = h * w
+        for i in range(n_frames):
+            roi = (0, i * h, w, h)
+            edges = canny.detect(cv2.cuda_GpuMat(stack, roi))
+            edge_density += cv2.cuda.countNonZero(edges) / n
+            lap = laplacian.apply(cv2.cuda_GpuMat(stack_f, roi))
+            mean = cv2.cuda.sum(lap)[0] / n
+            var = cv2.cuda.sqrSum(lap)[0] / n - mean * mean
+            noise_level += max(var, 0.0) / 10000.0
+        
+        return edge_density, noise_level
+    
+    @staticmethod
+    def _downsample(frame: np.ndarray) -> np.ndarray:
+        """Shrink frame so its longer side is at most MAX_ANALYSIS_SIDE."""
+        h, w = frame.shape[:2]
+        scale = MAX_ANALYSIS_SIDE / max(h, w)
+        if scale >= 1:
+            return frame
+        return cv2.resize(frame, (round(w * scale), round(h * scale)),
+                          interpolation=cv2.INTER_AREA)
+    
     def get_optimized_params(self, characteristics: Dict, styles: List[str]) -> Dict:
         """Get optimized parameters based on video characteristics."""
         params = {}
         
         for style in styles:
-            if 'Pencil' in style:
-                params[style] = self._optimize_pencil(characteristics)
-            elif 'Cartoon' in style:
-                params[style] = self._optimize_cartoon(characteristics)
-            elif 'Comic' in style:
-                params[style] = self._optimize_comic(characteristics)
-            elif 'Cinematic' in style:
-                params[style] = self._optimize_cinematic(characteristics)
+            optimizer = next((name for key, name in STYLE_OPTIMIZERS.items() if key in style), None)
+            if optimizer:
+                params[style] = getattr(self, optimizer)(characteristics)
         
         return params
     
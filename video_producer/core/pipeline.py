@@ -1,19 +1,21 @@
 """Async chunked video processing pipeline."""
 
-import asyncio
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Callable, Dict, Optional, List, Tuple
-from queue import Queue
-from threading import Thread
 import logging
 
 from .io import VideoReader, VideoWriter, VideoProbe
 from .checkpoint import CheckpointManager
 from .temporal import TemporalStabilizer
+from .pipeline_stream import run_stream
 
 logger = logging.getLogger(__name__)
 
+# Chunks can only be concatenated with stream copy when these all match
+STITCH_COPY_KEYS = ('codec', 'pix_fmt', 'width', 'height')
+
 
 class Pipeline:
     """Chunked video processing pipeline with resume capability."""
@@ -23,9 +25,10 @@ class Pipeline:
                  output_path: str,
                  stylizer: Callable[[np.ndarray, Dict], np.ndarray],
                  chunk_duration: int = 30,
-                 max_queue_size: int = 60,
+                 max_queue_size: int = 8,
                  use_temporal: bool = True,
-                 checkpoint_dir: Optional[str] = None):
+                 checkpoint_dir: Optional[str] = None,
+                 parallel_chunks: int = 1):
         
         self.input_path = input_path
         self.output_path = output_path
@@ -33,6 +36,10 @@ class Pipeline:
         self.chunk_duration = chunk_duration
         self.max_queue_size = max_queue_size
         self.use_temporal = use_temporal
+        # Chunks processed at once; the stylizer must then be thread-safe. All
+        # bundled stylizers are: Pencil/Cartoon/Comic/Cinematic keep no per-frame
+        # state, and FastStyle's MLSession serializes its shared IOBinding
+        self.parallel_chunks = max(1, parallel_chunks)
         
         # Metadata
         self.metadata = VideoProbe.probe(input_path)
@@ -60,64 +67,83 @@ class Pipeline:
                 crf: int = 18) -> Dict:
         """Process video with chunking and resume capability."""
         
-        # Check for existing checkpoint
-        start_frame = 0
+        # Chunks always cover the whole video; a checkpoint marks which are done
+        chunk_frames = int(self.chunk_duration * self.fps)
+        chunks = self._calculate_chunks(0, chunk_frames)
+        completed = set()
         if self.checkpoint_mgr and self.job_id:
             checkpoint = self.checkpoint_mgr.load(self.job_id)
             if checkpoint:
-                start_frame = checkpoint.get('last_frame', 0)
-                logger.info(f"Resuming from frame {start_frame}")
-        
-        # Calculate chunks
-        chunk_frames = int(self.chunk_duration * self.fps)
-        chunks = self._calculate_chunks(start_frame, chunk_frames)
+                completed = self._completed_chunks(checkpoint, chunks)
+                logger.info(f"Resuming with {len(completed)}/{len(chunks)} chunks done")
         
-        logger.info(f"Processing {len(chunks)} chunks, total {self.total_frames} frames")
+        pending = [c for c in chunks if c not in completed]
+        self.frames_processed = sum(end - start for start, end in completed)
         
-        # Process chunks
-        chunk_outputs = []
+        logger.info(f"Processing {len(pending)} chunks, total {self.total_frames} frames")
         
-        for i, (chunk_start, chunk_end) in enumerate(chunks):
+        def run_chunk(chunk: Tuple[int, int]) -> Optional[Tuple[int, int]]:
             if self.is_cancelled:
-                logger.warning("Processing cancelled")
-                break
-            
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}: frames {chunk_start}-{chunk_end}")
-            
-            chunk_output = self._process_chunk(
-                chunk_start, 
-                chunk_end,
-                codec=codec,
-                crf=crf
-            )
-            
-            chunk_outputs.append(chunk_output)
+                return None
+            chunk_start, chunk_end = chunk
+            logger.info(f"Processing chunk frames {chunk_start}-{chunk_end}")
+            # Concurrent chunks can't share one stabilizer's frame history
+            stabilizer = self.temporal_stabilizer
+            if self.parallel_chunks > 1 and self.use_temporal:
+                stabilizer = TemporalStabilizer()
+            self._process_chunk(chunk_start, chunk_end, codec=codec, crf=crf,
+                                temporal_stabilizer=stabilizer)
+            return chunk
+        
+        def chunk_done(chunk: Tuple[int, int]):
+            completed.add(chunk)
             
             # Update progress
-            self.frames_processed = chunk_end
+            self.frames_processed += chunk[1] - chunk[0]
             if progress_callback:
                 progress_callback(self.frames_processed, self.total_frames)
             
             # Save checkpoint
             if self.checkpoint_mgr and self.job_id:
                 self.checkpoint_mgr.save(self.job_id, {
-                    'last_frame': chunk_end,
+                    'completed_chunks': sorted(completed),
+                    'chunk_frames': chunk_frames,
                     'total_frames': self.total_frames,
-                    'chunks_completed': i + 1,
+                    'chunks_completed': len(completed),
                     'codec': codec,
                     'crf': crf
                 })
         
-        # Stitch chunks if multiple
-        if len(chunk_outputs) > 1:
-            logger.info("Stitching chunks...")
-            self._stitch_chunks(chunk_outputs, self.output_path)
-            # Clean up chunk files
-            for chunk_file in chunk_outputs:
-                Path(chunk_file).unlink(missing_ok=True)
-        elif len(chunk_outputs) == 1:
-            # Single chunk, just rename
-            Path(chunk_outputs[0]).rename(self.output_path)
+        # Process chunks
+        if self.parallel_chunks > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel_chunks) as pool:
+                for future in as_completed([pool.submit(run_chunk, c) for c in pending]):
+                    chunk = future.result()
+                    if chunk:
+                        chunk_done(chunk)
+        else:
+            for chunk in pending:
+                if not run_chunk(chunk):
+                    break
+                chunk_done(chunk)
+        
+        if self.is_cancelled:
+            # Keep finished chunk files so a later run can resume from them
+            logger.warning("Processing cancelled")
+        else:
+            # Chunk files in video order, whichever run produced them
+            chunk_outputs = [self._chunk_path(start, end) for start, end in chunks]
+            
+            # Stitch chunks if multiple
+            if len(chunk_outputs) > 1:
+                logger.info("Stitching chunks...")
+                self._stitch_chunks(chunk_outputs, self.output_path, codec=codec, crf=crf)
+                # Clean up chunk files
+                for chunk_file in chunk_outputs:
+                    Path(chunk_file).unlink(missing_ok=True)
+            elif len(chunk_outputs) == 1:
+                # Single chunk, just rename
+                Path(chunk_outputs[0]).rename(self.output_path)
         
         # Clear checkpoint on success
         if self.checkpoint_mgr and self.job_id and not self.is_cancelled:
@@ -142,10 +168,26 @@ class Pipeline:
         
         return chunks
     
-    def _process_chunk(self, start_frame: int, end_frame: int, codec: str, crf: int) -> str:
-        """Process a single chunk."""
+    def _completed_chunks(self, checkpoint: Dict, chunks: List[Tuple[int, int]]) -> set:
+        """Chunks a checkpoint marks as done whose files are still on disk."""
+        if 'completed_chunks' in checkpoint:
+            done = {tuple(c) for c in checkpoint['completed_chunks']}
+        else:
+            # Older checkpoints only record how far serial processing got
+            last_frame = checkpoint.get('last_frame', 0)
+            done = {c for c in chunks if c[1] <= last_frame}
+        return {c for c in chunks if c in done and Path(self._chunk_path(*c)).exists()}
+    
+    def _chunk_path(self, start_frame: int, end_frame: int) -> str:
+        """Temporary output file for one chunk."""
+        return f"{self.output_path}.chunk_{start_frame}_{end_frame}.mp4"
+    
+    def _process_chunk(self, start_frame: int, end_frame: int, codec: str, crf: int,
+                       temporal_stabilizer: Optional[TemporalStabilizer] = None) -> str:
+        """Process a single chunk (with the pipeline's own stabilizer unless one is given)."""
         # Create temporary chunk file
-        chunk_output = f"{self.output_path}.chunk_{start_frame}_{end_frame}.mp4"
+        chunk_output = self._chunk_path(start_frame, end_frame)
+        stabilizer = temporal_stabilizer or self.temporal_stabilizer
         
         num_frames = end_frame - start_frame
         
@@ -161,21 +203,41 @@ class Pipeline:
                 metadata=self.metadata
             ) as writer:
                 
-                for frame in reader.read_frames(max_frames=num_frames):
+                # Stabilized frames go into reused buffers: one per frame that can be
+                # in flight (queued, being encoded, being produced). The stabilizer
+                # keeps the newest as its state, which the next slot never is.
+                ring = [None] * (self.max_queue_size + 2)
+                ring_pos = 0
+                
+                def transform(frame: np.ndarray) -> np.ndarray:
+                    nonlocal ring_pos
+                    
                     # Apply stylizer
                     processed = self.stylizer(frame, self.metadata)
                     
                     # Apply temporal stabilization
-                    if self.temporal_stabilizer:
-                        processed = self.temporal_stabilizer.stabilize(processed)
+                    if stabilizer:
+                        out = ring[ring_pos]
+                        if out is None or out.shape != processed.shape:
+                            out = ring[ring_pos] = np.empty_like(processed)
+                        ring_pos = (ring_pos + 1) % len(ring)
+                        processed = stabilizer.stabilize(processed, out=out)
                     
-                    # Write frame
-                    writer.write_frame(processed)
+                    return processed
+                
+                # Decode and encode overlap with styling on background threads
+                run_stream(
+                    reader.read_frames(max_frames=num_frames),
+                    transform,
+                    writer.write_frame,
+                    maxsize=self.max_queue_size
+                )
         
         return chunk_output
     
-    def _stitch_chunks(self, chunk_files: List[str], output_path: str):
-        """Stitch chunks using FFmpeg concat."""
+    def _stitch_chunks(self, chunk_files: List[str], output_path: str,
+                       codec: str = 'h264_nvenc', crf: int = 18):
+        """Stitch chunks using FFmpeg concat (re-encoding if chunk streams differ)."""
         import subprocess
         import tempfile
         
@@ -186,22 +248,43 @@ class Pipeline:
             concat_file = f.name
         
         try:
-            # Concat with stream copy (lossless)
             cmd = [
                 'ffmpeg', '-y',
                 '-f', 'concat',
                 '-safe', '0',
                 '-i', concat_file,
-                '-c', 'copy',
-                output_path
             ]
             
+            if self._chunks_match(chunk_files):
+                # Concat with stream copy (lossless)
+                cmd.extend(['-c', 'copy'])
+            else:
+                # Stream copy would produce a broken file; re-encode instead
+                codec = VideoWriter._resolve_codec(codec)
+                logger.warning(f"Chunk streams differ, re-encoding with {codec}")
+                if 'nvenc' in codec:
+                    cmd.extend(['-c:v', codec, '-preset', 'p1', '-rc', 'vbr',
+                                '-cq', str(crf), '-b:v', '0'])
+                else:
+                    cmd.extend(['-c:v', 'libx264', '-preset', 'medium', '-crf', str(crf)])
+                cmd.extend(['-pix_fmt', 'yuv420p'])
+            cmd.append(output_path)
+            
             subprocess.run(cmd, check=True, capture_output=True)
             logger.info(f"Successfully stitched {len(chunk_files)} chunks")
             
         finally:
             Path(concat_file).unlink(missing_ok=True)
     
+    @staticmethod
+    def _chunks_match(chunk_files: List[str]) -> bool:
+        """Whether every chunk probes with the same STITCH_COPY_KEYS (probed concurrently)."""
+        probes = VideoProbe.probe_many(chunk_files)
+        if len(probes) != len(chunk_files):
+            return False
+        params = {tuple(meta[k] for k in STITCH_COPY_KEYS) for meta in probes.values()}
+        return len(params) == 1
+    
     def cancel(self):
         """Cancel processing."""
         self.is_cancelled = True
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Overlapped decode -> transform -> encode streaming with bounded queues."""
+
+import queue
+import threading
+import numpy as np
+from typing import Callable, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Polling interval for queue operations so shutdown is never blocked
+_POLL_SECONDS = 0.1
+
+
+def run_stream(frames: Iterable[np.ndarray],
+               transform: Callable[[np.ndarray], np.ndarray],
+               write: Callable[[np.ndarray], None],
+               maxsize: int = 4) -> int:
+    """Run decode, transform and encode as three overlapping stages.
+
+    `frames` is iterated on a decoder thread and `write` is called on an
+    encoder thread; `transform` runs on the calling thread, in frame order,
+    so stateful stylizers (e.g. temporal stabilization) stay correct.
+    Errors from any stage stop the others and are re-raised here.
+
+    Returns the number of frames written.
+    """
+    decode_q = queue.Queue(maxsize=maxsize)
+    encode_q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    errors = []
+
+    def put(q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once the stream is stopping."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def decode():
+        try:
+            for frame in frames:
+                if not put(decode_q, frame):
+                    return
+        except Exception as e:
+            logger.error(f"Decode stage failed: {e}")
+            errors.append(e)
+        put(decode_q, None)  # EOF
+
+    def encode():
+        try:
+            while True:
+                frame = encode_q.get()
+                if frame is None:
+                    return
+                write(frame)
+        except Exception as e:
+            logger.error(f"Encode stage failed: {e}")
+            errors.append(e)
+            stop.set()
+
+    decoder = threading.Thread(target=decode, name="stream-decode", daemon=True)
+    encoder = threading.Thread(target=encode, name="stream-encode", daemon=True)
+    decoder.start()
+    encoder.start()
+
+    count = 0
+    try:
+        while not stop.is_set():
+            try:
+                frame = decode_q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if frame is None:
+                break
+            if not put(encode_q, transform(frame)):
+                break
+            count += 1
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        # Let the encoder flush what it has, then release the decoder
+        while encoder.is_alive():
+            try:
+                encode_q.put(None, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        encoder.join()
+        stop.set()
+        decoder.join()
+
+    if errors:
+        raise errors[0]
+
+    return count
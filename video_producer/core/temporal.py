@@ -17,24 +17,29 @@ class TemporalStabilizer:
         self.prev_frame: Optional[np.ndarray] = None
         self.prev_edges: Optional[np.ndarray] = None
     
-    def stabilize(self, frame: np.ndarray) -> np.ndarray:
-        """Apply temporal smoothing."""
+    def stabilize(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply temporal smoothing (into `out` if given, same shape/dtype as frame).
+        
+        The returned frame (`out`, if given) is kept as the EMA state, so it
+        must stay untouched until the next call; callers rotating `out`
+        buffers need at least two.
+        """
         if self.prev_frame is None:
             self.prev_frame = frame.copy()
             return frame
         
-        # EMA blend
+        # EMA blend (addWeighted allocates a fresh array when `out` is None)
         stabilized = cv2.addWeighted(
             frame, self.alpha,
             self.prev_frame, 1 - self.alpha,
-            0
+            0, dst=out
         )
         
-        self.prev_frame = stabilized.copy()
+        self.prev_frame = stabilized
         return stabilized
     
     def stabilize_edges(self, edges: np.ndarray) -> np.ndarray:
-        """Stabilize edge maps."""
+        """Stabilize edge maps (the result is also the EMA state; don't modify it)."""
         if self.prev_edges is None:
             self.prev_edges = edges.copy()
             return edges
@@ -45,7 +50,7 @@ class TemporalStabilizer:
             0
         )
         
-        self.prev_edges = stabilized.copy()
+        self.prev_edges = stabilized
         return stabilized
     
     def reset(self):
@@ -7,13 +7,37 @@ from typing import List, Callable, Optional, Dict
 import logging
 import time
 
-from .io import VideoProbe, VideoReader, VideoWriter, check_nvenc_available
+from .io import VideoProbe, VideoReader, VideoWriter
+from .naming import style_slug
 from .presets import PresetManager
 from .pattern_learner import PatternLearner
 from .color import ColorSpaceManager
+from .pipeline_stream import run_stream
 
 logger = logging.getLogger(__name__)
 
+# Style-name substring -> stylizer class in the `stylizers` package (checked in order)
+STYLIZER_CLASSES = {
+    'Pencil': 'PencilStylizer',
+    'Cartoon': 'CartoonStylizer',
+    'Comic': 'ComicStylizer',
+    'Cinematic': 'CinematicStylizer',
+    'Neural': 'FastStyleStylizer',
+    'Fast': 'FastStyleStylizer',
+}
+
+FAST_STYLE_MODEL = 'assets/models/fast_style.onnx'
+
+# Frames buffered between decode/stylize/encode stages
+STREAM_PREFETCH = 8
+
+# Frames per call for stylizers with batched inference (`process_batch`)
+STYLE_BATCH_SIZE = 4
+
+# Previews are disposable: fastest NVENC preset, low-latency tuning, CBR
+# (libx264 ignores these and keeps the preset's CRF)
+PREVIEW_ENCODER = {'preset': 'p1', 'tune': 'll', 'bitrate': '8M'}
+
 
 class VideoProcessor:
     """Processes videos with intelligent parameter optimization."""
@@ -37,6 +61,9 @@ class VideoProcessor:
         # Pattern learner for intelligent optimization
         self.learner = PatternLearner()
         
+        # Stylizers are stateless after construction; build each style once
+        self._stylizers: Dict[str, object] = {}
+        
         # Analyze video and optimize parameters
         self._analyze_and_optimize()
     
@@ -88,7 +115,7 @@ class VideoProcessor:
         
         for style in self.styles:
             try:
-                output_path = self.output_dir / f"{Path(self.input_path).stem}_{style.lower().replace(' ', '_')}.mp4"
+                output_path = self.output_dir / f"{Path(self.input_path).stem}_{style_slug(style)}.mp4"
                 
                 logger.info(f"Processing style: {style}")
                 
@@ -112,10 +139,52 @@ class VideoProcessor:
         
         return results
     
+    def preview(self, seconds: float = 5.0, style: Optional[str] = None) -> Dict:
+        """Process the first `seconds` of the video with one style (default: first selected)."""
+        style = style or self.styles[0]
+        output_path = self.output_dir / f"{Path(self.input_path).stem}_{style_slug(style)}_preview.mp4"
+        max_frames = max(1, int(seconds * self.metadata['fps']))
+        start_time = time.time()
+        
+        try:
+            stylizer = self._get_stylizer(style)
+            self._process_single_style(
+                stylizer=stylizer,
+                style_name=style,
+                output_path=str(output_path),
+                max_frames=max_frames,
+                encoder_options=PREVIEW_ENCODER
+            )
+        except Exception as e:
+            logger.error(f"Preview failed for style {style}: {e}")
+            return {'success': False, 'error': f"{style}: {str(e)}"}
+        
+        return {
+            'success': True,
+            'output_path': str(output_path),
+            'style': style,
+            'processing_time': time.time() - start_time,
+            'preview_seconds': seconds,
+            'duration': self.metadata['duration']
+        }
+    
     def _get_stylizer(self, style: str):
-        """Get stylizer instance with optimized parameters."""
-        from stylizers import (PencilStylizer, CartoonStylizer, ComicStylizer,
-                              CinematicStylizer, FastStyleStylizer)
+        """Get stylizer instance with optimized parameters (cached per style)."""
+        stylizer = self._stylizers.get(style)
+        if stylizer is None:
+            stylizer = self._stylizers[style] = self._build_stylizer(style)
+        return stylizer
+    
+    def _build_stylizer(self, style: str):
+        """Build a stylizer instance with optimized parameters."""
+        import stylizers
+        
+        # First key contained in the style name picks the stylizer
+        cls_name = next((name for key, name in STYLIZER_CLASSES.items() if key in style), None)
+        if cls_name is None:
+            return stylizers.PencilStylizer()
+        if cls_name == 'FastStyleStylizer':
+            return stylizers.FastStyleStylizer(model_path=FAST_STYLE_MODEL)
         
         # Get optimized params for this style
         params = self.optimized_params.get(style, {})
@@ -123,18 +192,7 @@ class VideoProcessor:
         # Apply intensity scaling
         params = self._scale_params(params, self.effect_intensity)
         
-        if 'Pencil' in style:
-            return PencilStylizer(**params)
-        elif 'Cartoon' in style:
-            return CartoonStylizer(**params)
-        elif 'Comic' in style:
-            return ComicStylizer(**params)
-        elif 'Cinematic' in style:
-            return CinematicStylizer(**params)
-        elif 'Neural' in style or 'Fast' in style:
-            return FastStyleStylizer(model_path='assets/models/fast_style.onnx')
-        else:
-            return PencilStylizer()
+        return getattr(stylizers, cls_name)(**params)
     
     def _scale_params(self, params: Dict, intensity: float) -> Dict:
         """Scale effect parameters by intensity."""
@@ -157,13 +215,12 @@ class VideoProcessor:
         return scaled
     
     def _process_single_style(self, stylizer, style_name: str, output_path: str,
-                              progress_callback: Optional[Callable] = None):
-        """Process video with single style."""
-        # Determine codec
+                              progress_callback: Optional[Callable] = None,
+                              max_frames: Optional[int] = None,
+                              encoder_options: Optional[Dict] = None):
+        """Process video with single style (`encoder_options` go to VideoWriter)."""
+        # Determine codec (VideoWriter falls back to libx264 without NVENC)
         codec = self.preset.get('codec', 'libx264')
-        if codec == 'h264_nvenc' and not check_nvenc_available():
-            codec = 'libx264'
-            logger.warning("NVENC not available, falling back to libx264")
         
         # Process video
         frame_count = 0
@@ -177,20 +234,16 @@ class VideoProcessor:
                 self.metadata['fps'],
                 codec=codec,
                 crf=self.preset.get('crf', 18),
-                metadata=self.metadata
+                metadata=self.metadata,
+                **(encoder_options or {})
             ) as writer:
                 
-                for frame in reader.read_frames():
-                    # Apply style
-                    processed = stylizer.process(frame)
-                    
-                    # Write frame
-                    writer.write_frame(processed)
+                def report(done: int):
+                    nonlocal frame_count
                     
-                    frame_count += 1
-                    
-                    # Update progress
-                    if progress_callback and frame_count % 10 == 0:
+                    # Update progress (every 10 frames)
+                    prev, frame_count = frame_count, frame_count + done
+                    if progress_callback and frame_count // 10 > prev // 10:
                         elapsed = time.time() - start_time
                         fps = frame_count / elapsed if elapsed > 0 else 0
                         progress_callback(
@@ -198,5 +251,38 @@ class VideoProcessor:
                             self.metadata['nb_frames'],
                             fps
                         )
+                
+                # Decode and encode run on their own threads; styling stays on
+                # this one, in frame order, so stateful stylizers remain correct
+                if hasattr(stylizer, 'process_batch'):
+                    # Batched inference: the stream carries lists of frames
+                    def transform_batch(frames: List[np.ndarray]) -> List[np.ndarray]:
+                        processed = stylizer.process_batch(frames)
+                        report(len(processed))
+                        return processed
+                    
+                    def write_batch(frames: List[np.ndarray]):
+                        for frame in frames:
+                            writer.write_frame(frame)
+                    
+                    run_stream(
+                        reader.read_frame_batches(STYLE_BATCH_SIZE, max_frames=max_frames),
+                        transform_batch,
+                        write_batch,
+                        maxsize=max(1, STREAM_PREFETCH // STYLE_BATCH_SIZE)
+                    )
+                else:
+                    def transform(frame: np.ndarray) -> np.ndarray:
+                        # Apply style
+                        processed = stylizer.process(frame)
+                        report(1)
+                        return processed
+                    
+                    run_stream(
+                        reader.read_frames(max_frames=max_frames),
+                        transform,
+                        writer.write_frame,
+                        maxsize=STREAM_PREFETCH
+                    )
         
         logger.info(f"Completed {style_name}: {output_path}")
\ No newline at end of file
@@ -11,13 +11,21 @@ from core.io import VideoProbe
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python probe.py <video_path>")
+        print("Usage: python probe.py <video_path> [<video_path> ...]")
         sys.exit(1)
     
-    video_path = sys.argv[1]
+    video_paths = sys.argv[1:]
+    
+    if len(video_paths) > 1:
+        # Probe every file concurrently
+        results = VideoProbe.probe_many(video_paths)
+        print(json.dumps(results, indent=2))
+        if len(results) < len(video_paths):
+            sys.exit(1)
+        return
     
     try:
-        metadata = VideoProbe.probe(video_path)
+        metadata = VideoProbe.probe(video_paths[0])
         print(json.dumps(metadata, indent=2))
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -77,6 +77,7 @@ class CinematicStylizer:
     def _apply_lut(self, img: np.ndarray) -> np.ndarray:
         """Apply 3D LUT."""
         img_uint8 = (img * 255).astype(np.uint8)
+        # CPU kernel: apply_lut_3d_gpu hasn't been validated against it on CUDA yet
         result = self.color_manager.apply_lut_3d(img_uint8, self.lut)
         return result.astype(np.float32) / 255.0
     
@@ -2,7 +2,7 @@
 
 import numpy as np
 import cv2
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -17,7 +17,8 @@ class FastStyleStylizer:
                  model_path: str,
                  tile_size: int = 512,
                  overlap: int = 32,
-                 use_gpu: bool = True):
+                 use_gpu: bool = True,
+                 precision: str = 'fp32'):
         
         self.model_path = model_path
         self.tile_size = tile_size
@@ -27,7 +28,7 @@ class FastStyleStylizer:
         
         if Path(model_path).exists():
             try:
-                self.session = MLSession(model_path, use_gpu=use_gpu)
+                self.session = MLSession(model_path, use_gpu=use_gpu, precision=precision)
             except Exception as e:
                 print(f"Failed to load ONNX model: {e}")
                 self.session = None
@@ -56,6 +57,26 @@ class FastStyleStylizer:
             print(f"Style transfer failed: {e}")
             return frame
     
+    def process_batch(self, frames: List[np.ndarray], params: Optional[Dict] = None) -> List[np.ndarray]:
+        """Apply neural style transfer to same-sized frames, batching inference.
+        
+        Frames larger than `tile_size` are tiled and their tiles batched
+        across frames.
+        """
+        if self.session is None:
+            return [self.process(frame, params) for frame in frames]
+        
+        try:
+            return self.session.infer_tiled_batch(
+                frames,
+                tile_size=self.tile_size,
+                overlap=self.overlap
+            )
+            
+        except Exception as e:
+            print(f"Style transfer failed: {e}")
+            return [frame.copy() for frame in frames]
+    
     def __call__(self, frame: np.ndarray, metadata: Dict) -> np.ndarray:
         """Callable interface for pipeline."""
         return self.process(frame)
\ No newline at end of file
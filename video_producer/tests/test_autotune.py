@@ -0,0 +1,61 @@
+"""Test parameter auto-tuning."""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.autotune import AutoTuner, MAX_TUNE_SIDE
+
+
+def test_finds_peak_with_fewer_calls():
+    """Coordinate search should find a single-peaked optimum without a full grid."""
+    calls = []
+    
+    def stylizer(frame, params):
+        calls.append((params['a'], params['b']))
+        return frame
+    
+    # Score peaks at a=7, b=3 and ignores the image
+    tuner = AutoTuner()
+    tuner._evaluate_result = lambda img, metric: -((calls[-1][0] - 7) ** 2 + (calls[-1][1] - 3) ** 2)
+    
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    best = tuner.tune_parameters(frame, stylizer, {'a': list(range(20)), 'b': list(range(10))})
+    
+    assert best == {'a': 7, 'b': 3}
+    assert len(calls) < 20 * 10
+    assert len(calls) == len(set(calls)), "Each combination should be evaluated once"
+
+
+def test_tunes_on_downsampled_frame():
+    """Stylizer should see a frame no larger than MAX_TUNE_SIDE."""
+    shapes = []
+    
+    def stylizer(frame, params):
+        shapes.append(frame.shape)
+        return frame
+    
+    frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    AutoTuner().tune_parameters(frame, stylizer, {'blur': [1, 2, 3]})
+    
+    assert shapes and all(max(s[:2]) <= MAX_TUNE_SIDE for s in shapes)
+    assert shapes[0][2] == 3
+
+
+def test_metric_memoized_on_content():
+    """Identical stylized output should be scored once."""
+    tuner = AutoTuner()
+    computed = []
+    original = tuner._compute_metric
+    tuner._compute_metric = lambda img, metric: computed.append(metric) or original(img, metric)
+    
+    img = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+    first = tuner._evaluate_result(img, 'edge_coherence')
+    second = tuner._evaluate_result(img.copy(), 'edge_coherence')
+    tuner._evaluate_result(img, 'sharpness')
+    
+    assert first == second
+    assert computed == ['edge_coherence', 'sharpness']
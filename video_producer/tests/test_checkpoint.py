@@ -0,0 +1,53 @@
+"""Test checkpoint save/load for resume."""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.checkpoint
+from core.checkpoint import CheckpointManager
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'json'])
+def checkpoint_mgr(request, tmp_path, monkeypatch):
+    """CheckpointManager using orjson (when installed) and stdlib json."""
+    if request.param and not core.checkpoint.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(core.checkpoint, 'ORJSON_AVAILABLE', request.param)
+    return CheckpointManager(str(tmp_path))
+
+
+def test_save_load_roundtrip(checkpoint_mgr):
+    """Saved state should load back unchanged, with no temp file left behind."""
+    state = {'last_frame': 900, 'total_frames': 3000, 'chunks_completed': 1, 'codec': 'libx264'}
+    
+    checkpoint_mgr.save('job1', state)
+    
+    assert checkpoint_mgr.load('job1') == state
+    assert checkpoint_mgr.list_checkpoints() == ['job1']
+    assert not list(checkpoint_mgr.checkpoint_dir.glob('*.tmp'))
+
+
+def test_overwrite_and_clear(checkpoint_mgr):
+    """Later saves replace earlier ones; clear removes the checkpoint."""
+    checkpoint_mgr.save('job1', {'last_frame': 1})
+    checkpoint_mgr.save('job1', {'last_frame': 2})
+    
+    assert checkpoint_mgr.load('job1') == {'last_frame': 2}
+    
+    checkpoint_mgr.clear('job1')
+    assert checkpoint_mgr.load('job1') is None
+
+
+def test_numpy_values(tmp_path):
+    """orjson path should serialize numpy arrays."""
+    if not core.checkpoint.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    
+    mgr = CheckpointManager(str(tmp_path))
+    mgr.save('job1', {'weights': np.arange(3)})
+    
+    assert mgr.load('job1') == {'weights': [0, 1, 2]}
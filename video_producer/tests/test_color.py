@@ -0,0 +1,162 @@
+"""Test color space and LUT handling."""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.color
+from core.color import ColorSpaceManager
+
+
+def identity_lut(size: int = 17) -> np.ndarray:
+    """Identity 3D LUT indexed [r, g, b] -> (r, g, b) in [0, 1]."""
+    axis = np.linspace(0.0, 1.0, size, dtype=np.float32)
+    r, g, b = np.meshgrid(axis, axis, axis, indexing='ij')
+    return np.stack([r, g, b], axis=-1)
+
+
+@pytest.fixture(params=[True, False], ids=['numba', 'numpy'])
+def lut_backend(request, monkeypatch):
+    """Run LUT tests with the Numba kernel (when installed) and the NumPy fallback."""
+    if request.param and not core.color.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(core.color, 'NUMBA_AVAILABLE', request.param)
+
+
+def test_identity_lut(lut_backend):
+    """Identity LUT should reproduce the input (within float truncation)."""
+    frame = np.random.randint(0, 256, (64, 48, 3), dtype=np.uint8)
+    
+    result = ColorSpaceManager.apply_lut_3d(frame, identity_lut())
+    
+    assert result.shape == frame.shape
+    assert result.dtype == np.uint8
+    assert np.abs(result.astype(int) - frame.astype(int)).max() <= 1
+
+
+def test_lut_channel_swap(lut_backend):
+    """A LUT that swaps R and B should swap the channels."""
+    lut = identity_lut()[..., ::-1].copy()
+    frame = np.random.randint(0, 256, (32, 32, 3), dtype=np.uint8)
+    
+    result = ColorSpaceManager.apply_lut_3d(frame, lut)
+    
+    assert np.abs(result.astype(int) - frame[..., ::-1].astype(int)).max() <= 1
+
+
+def test_numba_matches_numpy(monkeypatch):
+    """Fused kernel should match the NumPy reference within one code value."""
+    if not core.color.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    
+    rng = np.random.default_rng(0)
+    lut = rng.random((17, 17, 17, 3), dtype=np.float32)
+    frame = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    
+    fused = ColorSpaceManager.apply_lut_3d(frame, lut)
+    monkeypatch.setattr(core.color, 'NUMBA_AVAILABLE', False)
+    reference = ColorSpaceManager.apply_lut_3d(frame, lut)
+    
+    assert np.abs(fused.astype(int) - reference.astype(int)).max() <= 1
+
+
+def test_tiled_lut_matches_untiled(monkeypatch):
+    """Tile edges (including partial tiles) should not change the result."""
+    monkeypatch.setattr(core.color, 'NUMBA_AVAILABLE', False)
+    rng = np.random.default_rng(0)
+    lut = rng.random((17, 17, 17, 3), dtype=np.float32)
+    frame = rng.integers(0, 256, (70, 45, 3), dtype=np.uint8)
+    
+    monkeypatch.setattr(core.color, 'LUT_TILE_SIZE', 16)
+    tiled = ColorSpaceManager.apply_lut_3d(frame, lut)
+    
+    np.testing.assert_array_equal(tiled, core.color._lut_tile(frame, lut))
+
+
+def test_gamma_lut_matches_power():
+    """Table-based sRGB -> linear should equal the direct power curve."""
+    frame = np.random.randint(0, 256, (64, 48, 3), dtype=np.uint8)
+    
+    linear = ColorSpaceManager.rgb_to_linear(frame)
+    expected = np.power(frame.astype(np.float32) / 255.0, 2.2)
+    
+    assert linear.dtype == np.float32
+    np.testing.assert_allclose(linear, expected, rtol=1e-6)
+    assert np.abs(ColorSpaceManager.linear_to_rgb(linear).astype(int) - frame.astype(int)).max() <= 1
+
+
+def test_gamma_into_out_buffers():
+    """Conversions should fill caller-owned buffers and match the allocating path."""
+    frame = np.random.randint(0, 256, (32, 24, 3), dtype=np.uint8)
+    linear_buf = np.empty(frame.shape, dtype=np.float32)
+    rgb_buf = np.empty(frame.shape, dtype=np.uint8)
+    
+    linear = ColorSpaceManager.rgb_to_linear(frame, out=linear_buf)
+    rgb = ColorSpaceManager.linear_to_rgb(linear, out=rgb_buf)
+    
+    assert linear is linear_buf and rgb is rgb_buf
+    np.testing.assert_array_equal(linear, ColorSpaceManager.rgb_to_linear(frame))
+    np.testing.assert_array_equal(rgb, ColorSpaceManager.linear_to_rgb(linear))
+    
+    float_frame = frame.astype(np.float64)
+    np.testing.assert_allclose(ColorSpaceManager.rgb_to_linear(float_frame, out=linear_buf),
+                               linear, rtol=1e-5)
+
+
+def test_gpu_lut_matches_cpu():
+    """GPU LUT path (or its CPU fallback) should match the reference."""
+    rng = np.random.default_rng(0)
+    lut = rng.random((17, 17, 17, 3), dtype=np.float32)
+    frame = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    
+    gpu = ColorSpaceManager.apply_lut_3d_gpu(frame, lut)
+    cpu = ColorSpaceManager.apply_lut_3d(frame, lut)
+    
+    assert gpu.shape == frame.shape
+    assert np.abs(gpu.astype(int) - cpu.astype(int)).max() <= 1
+
+
+def test_gpu_lut_volume_uploaded_once():
+    """The device LUT volume is cached per LUT array across frames."""
+    if core.color._cuda_torch() is None:
+        pytest.skip("CUDA torch not available")
+    lut = np.random.default_rng(0).random((17, 17, 17, 3), dtype=np.float32)
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    
+    ColorSpaceManager.apply_lut_3d_gpu(frame, lut)
+    volume = core.color._gpu_luts[id(lut)][1]
+    ColorSpaceManager.apply_lut_3d_gpu(frame, lut)
+    
+    assert core.color._gpu_luts[id(lut)][1] is volume
+
+
+def test_load_cube_lut(tmp_path):
+    """Headers, comments and blank lines are skipped; data keeps file order."""
+    size = 2
+    values = np.random.default_rng(0).random((size ** 3, 3)).astype(np.float32)
+    lut_file = tmp_path / "test.cube"
+    lut_file.write_text(
+        '# Created by test\nTITLE "Test LUT"\nLUT_3D_SIZE 2\n'
+        'DOMAIN_MIN 0.0 0.0 0.0\nDOMAIN_MAX 1.0 1.0 1.0\n\n'
+        + ''.join(f"{r:.6f} {g:.6f} {b:.6f}\n" for r, g, b in values)
+    )
+    
+    lut = ColorSpaceManager.load_cube_lut(str(lut_file))
+    
+    assert lut.shape == (size, size, size, 3)
+    np.testing.assert_allclose(lut.reshape(-1, 3), values, atol=1e-6)
+
+
+def test_loaded_cube_lut_is_read_only(tmp_path):
+    """The cached LUT is shared between callers, so it can't be modified in place."""
+    lut_file = tmp_path / "test.cube"
+    lut_file.write_text('LUT_3D_SIZE 2\n' + '0.5 0.5 0.5\n' * 8)
+    
+    lut = ColorSpaceManager.load_cube_lut(str(lut_file))
+    
+    assert lut is ColorSpaceManager.load_cube_lut(str(lut_file))
+    with pytest.raises(ValueError):
+        lut[0, 0, 0, 0] = 1.0
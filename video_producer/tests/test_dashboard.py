@@ -0,0 +1,39 @@
+"""Test dashboard upload persistence."""
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.pages import dashboard
+
+
+class FakeUpload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile."""
+    
+    def __init__(self, data: bytes, name: str, file_id: str):
+        super().__init__(data)
+        self.name = name
+        self.file_id = file_id
+        self.size = len(data)
+
+
+def test_same_name_and_size_with_changed_middle_is_rewritten(tmp_path, monkeypatch):
+    """Uploads are addressed by their full content, not just size and ends."""
+    monkeypatch.setattr(dashboard, 'UPLOAD_DIR', tmp_path)
+    monkeypatch.setitem(dashboard.st.session_state, '_saved_uploads', {})
+    
+    size = 5 * 1024 * 1024
+    original = bytearray(size)
+    edited = bytearray(size)
+    edited[size // 2] = 1
+    
+    first = dashboard._save_upload(FakeUpload(bytes(original), 'clip.mp4', 'a'))
+    second = dashboard._save_upload(FakeUpload(bytes(edited), 'clip.mp4', 'b'))
+    again = dashboard._save_upload(FakeUpload(bytes(original), 'clip.mp4', 'c'))
+    
+    assert first != second and again == first
+    assert Path(second).read_bytes() == bytes(edited)
+    assert Path(first).read_bytes() == bytes(original)
+    assert not list(tmp_path.rglob('*.part'))
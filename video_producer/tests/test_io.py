@@ -0,0 +1,111 @@
+"""Test video reading and writing through FFmpeg."""
+
+import pytest
+import numpy as np
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.io import VideoProbe, VideoReader, VideoWriter, _parse_frame_rate
+
+pytestmark = pytest.mark.skipif(
+    shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None,
+    reason="ffmpeg/ffprobe not installed"
+)
+
+
+def write_test_video(path: Path, frames):
+    """Encode frames with libx264."""
+    h, w = frames[0].shape[:2]
+    with VideoWriter(str(path), w, h, 30, codec='libx264') as writer:
+        for frame in frames:
+            writer.write_frame(frame)
+
+
+def test_write_read_roundtrip(tmp_path):
+    """Contiguous and strided frames should all be written and read back."""
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (64, 96, 3), dtype=np.uint8) for _ in range(4)]
+    # Non-contiguous view (channel-reversed) exercises the copy path
+    frames.append(frames[0][:, :, ::-1])
+    
+    output = tmp_path / "roundtrip.mp4"
+    write_test_video(output, frames)
+    
+    with VideoReader(str(output)) as reader:
+        decoded = list(reader.read_frames())
+    
+    assert len(decoded) == len(frames)
+    assert all(f.shape == (64, 96, 3) for f in decoded)
+
+
+def test_read_frame_batches(tmp_path):
+    """Batches should cover every frame in order, with a short final batch."""
+    frames = [np.full((32, 48, 3), i * 20, dtype=np.uint8) for i in range(7)]
+    output = tmp_path / "batches.mp4"
+    write_test_video(output, frames)
+    
+    with VideoReader(str(output)) as reader:
+        batches = list(reader.read_frame_batches(batch_size=3))
+    
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert all(f.shape == (32, 48, 3) for b in batches for f in b)
+    # Flat frames survive encoding closely enough to check ordering
+    means = [f.mean() for b in batches for f in b]
+    assert np.all(np.diff(means) > 0)
+
+
+def test_writer_falls_back_without_nvenc(monkeypatch):
+    """An NVENC codec the FFmpeg build lacks should become libx264."""
+    import core.io
+    monkeypatch.setattr(core.io, 'nvenc_encoders', lambda: frozenset())
+    
+    assert VideoWriter('out.mp4', 64, 64, 30, codec='h264_nvenc').codec == 'libx264'
+    assert VideoWriter('out.mp4', 64, 64, 30, codec='libx265').codec == 'libx265'
+
+
+def test_writer_nvenc_cbr_args(monkeypatch):
+    """Tune/bitrate switch NVENC to CBR; libx264 keeps CRF and ignores them."""
+    import core.io
+    monkeypatch.setattr(core.io, 'nvenc_encoders', lambda: frozenset({'h264_nvenc'}))
+    
+    args = VideoWriter('out.mp4', 64, 64, 30, codec='h264_nvenc', preset='p1',
+                       tune='ll', bitrate='8M')._video_codec_args()
+    assert args[:8] == ['-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-rc', 'cbr']
+    assert '-cq' not in args
+    
+    args = VideoWriter('out.mp4', 64, 64, 30, codec='libx264', crf=23,
+                       tune='ll', bitrate='8M')._video_codec_args()
+    assert args[args.index('-crf') + 1] == '23' and '-tune' not in args
+
+
+def test_probe_many(tmp_path):
+    """Concurrent probing should match single probes and skip unreadable files."""
+    frames = [np.zeros((32, 48, 3), dtype=np.uint8)] * 3
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"clip{i}.mp4"
+        write_test_video(path, frames)
+        paths.append(str(path))
+    bad = tmp_path / "not_a_video.mp4"
+    bad.write_bytes(b"garbage")
+    
+    results = VideoProbe.probe_many(paths + [str(bad)], max_workers=2)
+    
+    assert set(results) == set(paths)
+    assert results[paths[0]] == VideoProbe.probe(paths[0])
+    assert results[paths[0]]['fps'] == 30
+
+
+@pytest.mark.parametrize("rate, expected", [
+    ('30/1', 30.0),
+    ('30000/1001', 30000 / 1001),
+    ('25', 25.0),
+    ('0/0', 30.0),
+    ('__import__("os")', 30.0),
+])
+def test_parse_frame_rate(rate, expected):
+    """Rates are parsed as fractions, never evaluated."""
+    assert _parse_frame_rate(rate) == pytest.approx(expected)
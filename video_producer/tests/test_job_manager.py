@@ -0,0 +1,85 @@
+"""Test job dispatch to worker processes."""
+
+import pytest
+import queue
+import time
+from dataclasses import asdict
+from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.job_manager import Job, JobManager
+
+
+def test_job_to_dict():
+    """to_dict matches asdict and doesn't share the styles list."""
+    job = Job(id='abc', input_path='in.mp4', output_path='out', styles=['Cartoon'], preset='Balanced')
+    
+    d = job.to_dict()
+    
+    assert d == asdict(job)
+    d['styles'].append('Comic')
+    assert job.styles == ['Cartoon']
+
+
+def test_job_timestamps_format_on_demand():
+    """Epoch-ms timestamps are exposed as ISO strings, None until set."""
+    job = Job(id='abc', input_path='in.mp4', output_path='out', styles=['Cartoon'],
+              preset='Balanced', created_at_ms=1_700_000_000_123)
+    
+    assert job.created_at == datetime.fromtimestamp(1_700_000_000.123).isoformat()
+    assert job.started_at is None and job.completed_at is None
+
+
+def test_take_job_steals_and_skips_cancelled():
+    """Idle workers take their own jobs first, then steal; cancelled jobs are dropped."""
+    jm = JobManager()
+    saved = getattr(jm, 'queues', None)
+    try:
+        jm.queues = [queue.SimpleQueue(), queue.SimpleQueue()]
+        for job_id, status in [('own', 'Queued'), ('gone', 'Cancelled'), ('other', 'Queued')]:
+            jm.jobs[job_id] = Job(id=job_id, input_path='in.mp4', output_path='out',
+                                  styles=['Cartoon'], preset='Balanced', status=status)
+        jm.queues[0].put('own')
+        jm.queues[1].put('gone')
+        jm.queues[1].put('other')
+        
+        assert jm._take_job(0) == 'own'
+        assert jm._take_job(0) == 'other'
+        assert jm._take_job(1) is None
+    finally:
+        jm.queues = saved
+        jm.jobs.clear()
+
+
+def wait_for(jm, job_ids, timeout=60.0):
+    """Wait until none of the jobs is queued or processing."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(jm.get_job(j).status not in ('Queued', 'Processing') for j in job_ids):
+            return
+        time.sleep(0.1)
+    pytest.fail("jobs did not finish")
+
+
+def test_failed_and_cancelled_jobs(tmp_path):
+    """Worker errors come back as Failed; a cancelled job stays Cancelled."""
+    jm = JobManager()
+    try:
+        missing = str(tmp_path / "missing.mp4")
+        failed = jm.add_job(missing, str(tmp_path), ['Cartoon'], 'Balanced')
+        cancelled = jm.add_job(missing, str(tmp_path), ['Cartoon'], 'Balanced')
+        jm.cancel_job(cancelled)
+        
+        wait_for(jm, [failed, cancelled])
+        
+        assert jm.get_job(failed).status == 'Failed'
+        assert jm.get_job(failed).error
+        assert jm.get_job(failed).completed_at
+        assert jm.get_job(cancelled).status == 'Cancelled'
+        assert sum(s['failed'] for s in jm.worker_stats) >= 1
+    finally:
+        jm.shutdown()
+        jm.jobs.clear()
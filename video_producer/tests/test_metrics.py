@@ -0,0 +1,77 @@
+"""Test frame quality metrics."""
+
+import pytest
+import json
+import numpy as np
+import cv2
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.metrics import MetricsCollector
+
+
+@pytest.fixture
+def frames():
+    """A random frame and a blurred copy of it."""
+    rng = np.random.default_rng(0)
+    original = rng.integers(0, 256, (96, 128, 3), dtype=np.uint8)
+    processed = cv2.GaussianBlur(original, (5, 5), 0)
+    return original, processed
+
+
+def test_metrics_match_reference(frames, tmp_path):
+    """Fused metrics should match the straightforward definitions."""
+    structural_similarity = pytest.importorskip("skimage.metrics").structural_similarity
+    original, processed = frames
+    collector = MetricsCollector(str(tmp_path))
+    
+    metrics = collector.collect_frame_metrics(original, processed, 'test', 0, 0.01)
+    
+    gray_o = cv2.cvtColor(original, cv2.COLOR_RGB2GRAY)
+    gray_p = cv2.cvtColor(processed, cv2.COLOR_RGB2GRAY)
+    assert metrics['ssim'] == pytest.approx(structural_similarity(gray_o, gray_p), abs=1e-5)
+    assert metrics['mse'] == pytest.approx(
+        np.mean((original.astype(float) - processed.astype(float)) ** 2))
+    assert metrics['sharpness'] == pytest.approx(cv2.Laplacian(gray_p, cv2.CV_64F).var(), rel=1e-5)
+    assert metrics['edge_coherence'] == pytest.approx(
+        np.mean(cv2.Canny(gray_p, 50, 150) > 0))
+
+
+def test_identical_frames(frames, tmp_path):
+    """A frame compared with itself has SSIM 1 and MSE 0."""
+    original, _ = frames
+    collector = MetricsCollector(str(tmp_path))
+    
+    metrics = collector.collect_frame_metrics(original, original, 'test', 0, 0.01)
+    
+    assert metrics['ssim'] == pytest.approx(1.0)
+    assert metrics['mse'] == 0
+
+
+def test_log_grows_and_summarizes(frames, tmp_path, monkeypatch):
+    """Columns should grow past their initial capacity without losing frames."""
+    import core.metrics
+    monkeypatch.setattr(core.metrics, 'INITIAL_CAPACITY', 2)
+    original, processed = frames
+    collector = MetricsCollector(str(tmp_path))
+    
+    for i in range(5):
+        collector.collect_frame_metrics(original, processed, 'test', i, 0.01 * (i + 1))
+    
+    log = collector.metrics_log
+    assert [m['frame_idx'] for m in log] == list(range(5))
+    assert list(log[0]) == ['frame_idx', 'style', 'processing_time', 'edge_coherence',
+                            'ssim', 'mse', 'sharpness']
+    
+    summary = collector.get_summary()
+    assert summary['total_frames'] == 5
+    assert summary['avg_processing_time'] == pytest.approx(0.03)
+    assert summary['avg_ssim'] == pytest.approx(log[0]['ssim'])
+    
+    collector.save_metrics('job')
+    saved = json.loads((tmp_path / 'job_metrics.json').read_text())
+    assert len(saved) == 5
+    assert saved[2]['frame_idx'] == 2 and saved[2]['style'] == 'test'
+    assert saved[2]['ssim'] == pytest.approx(log[2]['ssim'])
@@ -0,0 +1,159 @@
+"""Test ML session helpers that don't need a model."""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.ml_session import MLSession, _feather_weights
+
+
+def test_feather_weights_ramp():
+    """Weights ramp up over `overlap` pixels from every edge and are 1 inside."""
+    weight = _feather_weights(64, 48, 8)
+    
+    assert weight.shape == (64, 48)
+    assert weight.dtype == np.float32
+    np.testing.assert_allclose(weight[32, :9], np.arange(9) / 8)
+    np.testing.assert_allclose(weight[:9, 24], np.arange(9) / 8)
+    assert weight[8:-8, 8:-8].min() == 1.0
+    # Symmetric, and a corner is as low as its nearest edge
+    np.testing.assert_array_equal(weight, weight[::-1, ::-1])
+    assert weight[2, 5] == pytest.approx(2 / 8)
+
+
+def test_feather_weights_cached_and_read_only():
+    """Uniform tiles share one read-only map."""
+    assert _feather_weights(32, 32, 4) is _feather_weights(32, 32, 4)
+    assert not _feather_weights(32, 32, 4).flags.writeable
+    assert _feather_weights(16, 16, 0).min() == 1.0
+
+
+def test_feather_weights_selected_sides():
+    """Only the selected sides ramp; image-border sides keep full weight."""
+    weight = _feather_weights(32, 32, 8, (False, True, False, False))
+    
+    np.testing.assert_allclose(weight[:, :9], np.tile(np.arange(9) / 8, (32, 1)))
+    assert weight[:, 8:].min() == 1.0
+
+
+@pytest.fixture
+def invert_model(tmp_path):
+    """Tiny ONNX model computing 1 - x on NCHW input of any size."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import helper, TensorProto
+    
+    x = helper.make_tensor_value_info('x', TensorProto.FLOAT, ['N', 3, 'H', 'W'])
+    y = helper.make_tensor_value_info('y', TensorProto.FLOAT, ['N', 3, 'H', 'W'])
+    one = helper.make_tensor('one', TensorProto.FLOAT, [], [1.0])
+    graph = helper.make_graph([helper.make_node('Sub', ['one', 'x'], ['y'])],
+                              'invert', [x], [y], [one])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    
+    path = tmp_path / "invert.onnx"
+    onnx.save(model, str(path))
+    return str(path)
+
+
+def test_bound_inference_matches_run(invert_model):
+    """IOBinding path (bound to CPU here) should match session.run, across shape changes."""
+    session = MLSession(invert_model, use_gpu=False)
+    frames = np.random.default_rng(0).integers(0, 256, (2, 20, 30, 3), dtype=np.uint8)
+    expected = session.infer_batch(frames)
+    assert expected.shape == frames.shape and expected.dtype == np.uint8
+    assert np.abs(expected.astype(int) - (255 - frames.astype(int))).max() <= 1
+    
+    session._init_binding('cpu')
+    
+    np.testing.assert_array_equal(session.infer_batch(frames), expected)
+    np.testing.assert_array_equal(session.infer_batch(frames[:1]), expected[:1])
+    np.testing.assert_array_equal(session.infer_batch(frames[::-1].copy()), expected[::-1])
+
+
+def test_tiled_matches_numpy_blend(invert_model, monkeypatch):
+    """Numba and NumPy tile accumulation agree, and overlaps blend without wrapping."""
+    import core.ml_session as ml_session
+    
+    session = MLSession(invert_model, use_gpu=False)
+    img = np.random.default_rng(1).integers(0, 256, (100, 140, 3), dtype=np.uint8)
+    result = session.infer_tiled(img, tile_size=64, overlap=16)
+    
+    monkeypatch.setattr(ml_session, 'NUMBA_AVAILABLE', False)
+    expected = session.infer_tiled(img, tile_size=64, overlap=16)
+    
+    assert result.shape == img.shape and result.dtype == np.uint8
+    assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+    # Every pixel, image borders included, reproduces 255 - x
+    assert np.abs(expected.astype(int) - (255 - img.astype(int))).max() <= 1
+
+
+@pytest.mark.parametrize('precision', ['fp16', 'int8'])
+def test_reduced_precision_close_to_fp32(invert_model, precision):
+    """Converted models are cached beside the original and stay close to FP32 output."""
+    pytest.importorskip("onnxruntime.quantization")
+    frames = np.random.default_rng(2).integers(0, 256, (1, 20, 30, 3), dtype=np.uint8)
+    expected = MLSession(invert_model, use_gpu=False, precision='fp32').infer_batch(frames)
+    
+    session = MLSession(invert_model, use_gpu=False, precision=precision)
+    
+    assert Path(invert_model).with_name(f"invert.{precision}.onnx").exists()
+    assert session._input_dtype == (np.float16 if precision == 'fp16' else np.float32)
+    assert np.abs(session.infer_batch(frames).astype(int) - expected.astype(int)).max() <= 2
+
+
+def test_failed_conversion_not_retried(invert_model, monkeypatch):
+    """A conversion that failed once falls back to FP32 without being attempted again."""
+    quantization = pytest.importorskip("onnxruntime.quantization")
+    calls = []
+
+    def failing_quantize(*args, **kwargs):
+        calls.append(args)
+        raise RuntimeError("unsupported op")
+
+    monkeypatch.setattr(quantization, 'quantize_dynamic', failing_quantize)
+
+    for _ in range(2):
+        session = MLSession(invert_model, use_gpu=False, precision='int8')
+        assert session.session is not None
+
+    assert len(calls) == 1
+    assert not Path(invert_model).with_name("invert.int8.onnx").exists()
+
+
+def test_unknown_precision_rejected(invert_model):
+    with pytest.raises(ValueError):
+        MLSession(invert_model, use_gpu=False, precision='int4')
+
+
+def test_tiled_batch_matches_per_frame(invert_model):
+    """Tiles batched across frames give the same frames as tiling each one alone."""
+    session = MLSession(invert_model, use_gpu=False)
+    frames = list(np.random.default_rng(3).integers(0, 256, (3, 100, 140, 3), dtype=np.uint8))
+    
+    batched = session.infer_tiled_batch(frames, tile_size=64, overlap=16, max_batch=5)
+    
+    assert len(batched) == 3
+    for frame, result in zip(frames, batched):
+        np.testing.assert_array_equal(result, session.infer_tiled(frame, tile_size=64, overlap=16))
+
+
+def test_bound_inference_thread_safe(invert_model):
+    """Concurrent callers sharing one bound session each get their own result."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    session = MLSession(invert_model, use_gpu=False)
+    session._init_binding('cpu')
+    rng = np.random.default_rng(4)
+    # Different shapes force rebinding while other threads run
+    batches = [rng.integers(0, 256, (1, 16 + i % 3, 24, 3), dtype=np.uint8) for i in range(60)]
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(session.infer_batch, batches))
+    
+    for batch, result in zip(batches, results):
+        assert result.shape == batch.shape
+        assert np.abs(result.astype(int) - (255 - batch.astype(int))).max() <= 1
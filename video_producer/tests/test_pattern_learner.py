@@ -0,0 +1,50 @@
+"""Test video characteristic analysis."""
+
+import pytest
+import numpy as np
+import cv2
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.pattern_learner import PatternLearner
+
+
+def test_analyze_matches_per_frame_stats():
+    """Stacked stats should equal per-frame averages for frames below the analysis size."""
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (120, 160, 3), dtype=np.uint8) for _ in range(3)]
+    
+    result = PatternLearner().analyze_video(frames)
+    
+    grays = [cv2.cvtColor(f, cv2.COLOR_RGB2GRAY) for f in frames]
+    assert result['brightness'] == pytest.approx(np.mean([g.mean() for g in grays]) / 255.0)
+    assert result['contrast'] == pytest.approx(np.mean([g.std() for g in grays]) / 128.0)
+    assert result['color_richness'] == pytest.approx(
+        np.mean([[f[:, :, c].std() for c in range(3)] for f in frames]) / 128.0)
+    assert result['edge_density'] == pytest.approx(
+        np.mean([np.mean(cv2.Canny(g, 50, 150) > 0) for g in grays]))
+
+
+def test_analyze_large_frames_in_range():
+    """Large frames are downsampled and every characteristic stays in [0, 1]."""
+    frames = [np.full((1080, 1920, 3), 200, dtype=np.uint8)] * 2
+    
+    result = PatternLearner().analyze_video(frames)
+    
+    assert result['brightness'] == pytest.approx(200 / 255.0)
+    assert all(0.0 <= v <= 1.0 for v in result.values())
+
+
+def test_optimized_params_per_style():
+    """Each known style gets its optimizer's params; unknown styles are skipped."""
+    learner = PatternLearner()
+    char = learner._get_default_characteristics()
+    
+    params = learner.get_optimized_params(char, ['Pencil Sketch', 'Comic/Halftone', 'Fast Neural Style'])
+    
+    assert params == {
+        'Pencil Sketch': learner._optimize_pencil(char),
+        'Comic/Halftone': learner._optimize_comic(char),
+    }
@@ -0,0 +1,66 @@
+"""Test the overlapped decode/transform/encode stream."""
+
+import pytest
+import numpy as np
+import threading
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.pipeline_stream import run_stream
+
+
+def make_frames(n):
+    """Tiny frames tagged with their index."""
+    return [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(n)]
+
+
+def test_order_and_count():
+    """All frames should be transformed in order and written in order."""
+    written = []
+    transform_threads = set()
+    
+    def transform(frame):
+        transform_threads.add(threading.current_thread())
+        return frame + 1
+    
+    count = run_stream(iter(make_frames(50)), transform, written.append, maxsize=2)
+    
+    assert count == 50
+    assert [int(f[0, 0, 0]) for f in written] == list(range(1, 51))
+    assert transform_threads == {threading.current_thread()}
+
+
+def test_transform_error_propagates():
+    """A failing transform should stop the stream and raise."""
+    def transform(frame):
+        if frame[0, 0, 0] == 5:
+            raise ValueError("boom")
+        return frame
+    
+    with pytest.raises(ValueError, match="boom"):
+        run_stream(iter(make_frames(100)), transform, lambda f: None, maxsize=2)
+
+
+def test_write_error_propagates():
+    """A failing writer should stop the stream and raise."""
+    def write(frame):
+        raise IOError("disk full")
+    
+    with pytest.raises(IOError, match="disk full"):
+        run_stream(iter(make_frames(100)), lambda f: f, write, maxsize=2)
+
+
+def test_decode_error_propagates():
+    """An error while decoding should surface after already-decoded frames are written."""
+    written = []
+    
+    def frames():
+        yield from make_frames(3)
+        raise RuntimeError("corrupt packet")
+    
+    with pytest.raises(RuntimeError, match="corrupt packet"):
+        run_stream(frames(), lambda f: f, written.append)
+    
+    assert len(written) == 3
@@ -0,0 +1,43 @@
+"""Test Style Lab feedback persistence."""
+
+import json
+import threading
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.pages import style_lab
+
+
+def test_interleaved_writers_keep_every_entry(tmp_path, monkeypatch):
+    """Entries from concurrent sessions and from other writers of the file all survive."""
+    feedback_file = tmp_path / "logs" / "feedback.json"
+    monkeypatch.setattr(style_lab, 'FEEDBACK_FILE', feedback_file)
+    monkeypatch.setattr(style_lab, '_pending_feedback', [])
+    monkeypatch.setattr(style_lab, '_pending_since', None)
+    
+    def session(name):
+        for i in range(20):
+            style_lab._queue_feedback({'notes': f"{name}-{i}"})
+            if i % 5 == 4:
+                style_lab._flush_feedback(force=True)
+    
+    threads = [threading.Thread(target=session, args=(name,)) for name in ('a', 'b')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    # Another process appends between our flushes
+    saved = json.loads(feedback_file.read_text())
+    feedback_file.write_text(json.dumps(saved + [{'notes': 'other'}]))
+    style_lab._queue_feedback({'notes': 'last'})
+    style_lab._flush_feedback()  # not pending long enough yet
+    assert len(json.loads(feedback_file.read_text())) == 41
+    style_lab._flush_pending_feedback()
+    
+    notes = [e['notes'] for e in json.loads(feedback_file.read_text())]
+    assert sorted(notes) == sorted([f"{n}-{i}" for n in 'ab' for i in range(20)] + ['other', 'last'])
+    assert [n for n in notes if n.startswith('a')] == [f"a-{i}" for i in range(20)]
+    assert not feedback_file.with_suffix('.json.tmp').exists()
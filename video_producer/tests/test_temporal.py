@@ -0,0 +1,48 @@
+"""Test temporal stabilization."""
+
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.temporal import TemporalStabilizer
+
+
+def ema(frames, alpha=0.3):
+    """Reference EMA, rounded like cv2.addWeighted at every step."""
+    prev = frames[0].copy()
+    result = [prev]
+    for frame in frames[1:]:
+        prev = np.clip(np.round(alpha * frame + (1 - alpha) * prev.astype(np.float64)),
+                       0, 255).astype(np.uint8)
+        result.append(prev)
+    return result
+
+
+def test_stabilize_matches_ema():
+    frames = [np.full((8, 8, 3), v, dtype=np.uint8) for v in (0, 200, 50, 255, 10)]
+    stabilizer = TemporalStabilizer()
+    
+    outputs = [stabilizer.stabilize(f).copy() for f in frames]
+    
+    for actual, expected in zip(outputs, ema(frames)):
+        np.testing.assert_allclose(actual, expected, atol=1)
+
+
+def test_stabilize_into_rotating_out_buffers():
+    """Blending into caller buffers keeps the last one as state, without a copy."""
+    frames = [np.full((8, 8, 3), v, dtype=np.uint8) for v in (0, 200, 50, 255, 10)]
+    stabilizer = TemporalStabilizer()
+    ring = [np.empty_like(frames[0]) for _ in range(2)]
+    
+    outputs = []
+    for i, f in enumerate(frames):
+        buf = ring[i % 2]
+        result = stabilizer.stabilize(f, out=buf)
+        if i > 0:
+            assert result is buf and stabilizer.prev_frame is buf
+        outputs.append(result.copy())
+    
+    for actual, expected in zip(outputs, ema(frames)):
+        np.testing.assert_allclose(actual, expected, atol=1)
@@ -0,0 +1,62 @@
+"""Test video processor helpers."""
+
+import re
+import shutil
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.io import VideoReader, VideoWriter
+from core.naming import style_slug
+from core.video_processor import VideoProcessor
+from app.pages.dashboard import STYLE_NAMES as DASHBOARD_STYLES
+from app.pages.style_lab import STYLE_NAMES as LAB_STYLES
+
+
+@pytest.mark.parametrize('style', sorted(set(DASHBOARD_STYLES) | set(LAB_STYLES)))
+def test_style_slug_is_filename_safe(style):
+    """Every offered style maps to a bare filename component."""
+    slug = style_slug(style)
+    
+    assert re.fullmatch(r'[a-z0-9]+(_[a-z0-9]+)*', slug)
+
+
+def test_style_slug_examples():
+    assert style_slug('Pencil Sketch') == 'pencil_sketch'
+    assert style_slug('Comic/Halftone') == 'comic_halftone'
+
+
+class InvertBatchStylizer:
+    """Stylizer with batched inference that records its batch sizes."""
+    
+    def __init__(self):
+        self.batch_sizes = []
+    
+    def process(self, frame):
+        raise AssertionError("process_batch should be used")
+    
+    def process_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        return [255 - frame for frame in frames]
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
+def test_batched_stylizer_used_in_order(tmp_path):
+    """Stylizers with process_batch get frame batches and output stays in frame order."""
+    source = tmp_path / "in.mp4"
+    with VideoWriter(str(source), 64, 48, 30, codec='libx264') as writer:
+        for i in range(10):
+            writer.write_frame(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    
+    processor = VideoProcessor(str(source), str(tmp_path / "out"), ['Cartoon'])
+    stylizer = InvertBatchStylizer()
+    output = tmp_path / "out.mp4"
+    processor._process_single_style(stylizer, 'Invert', str(output))
+    
+    assert stylizer.batch_sizes == [4, 4, 2]
+    with VideoReader(str(output)) as reader:
+        means = [frame.mean() for frame in reader.read_frames()]
+    np.testing.assert_allclose(means, [255 - i * 20 for i in range(10)], atol=3)